@@ -1,6 +1,11 @@
 from elinkapi.__version__ import __version__
 
 from elinkapi.elinkapi import Elink
+from elinkapi.session import ElinkSession
+from elinkapi.retry import RetryPolicy, RetryStats
+from elinkapi.ratelimit import RateLimiter, MemoryBucketStore, SQLiteBucketStore
+from elinkapi.cache import RevisionCache, RecordCache, ConditionalCache
+from elinkapi.async_elinkapi import AsyncElink
 from elinkapi.person import Person
 from elinkapi.affiliation import Affiliation
 from elinkapi.geolocation import Geolocation
@@ -15,6 +20,14 @@ from elinkapi.related_identifier import RelatedIdentifier
 from elinkapi.revision_comparison import RevisionComparison
 from elinkapi.revision import Revision
 from elinkapi.query import Query
+from elinkapi.scan import ParallelScan
+from elinkapi.bulk import BulkResult
+from elinkapi.pipeline import ChangeJournal
+from elinkapi.sync import SQLiteRecordStore
+from elinkapi.keys import SQLiteKeyStore
+from elinkapi.index import RecordIndex
+from elinkapi.status import StatusReport
+from elinkapi.async_query import AsyncQuery
 
 from elinkapi.exceptions import (
     NotFoundException,
@@ -36,6 +49,16 @@ __all__ = (
     "ForbiddenException",
     # connector
     "Elink",
+    "ElinkSession",
+    "RetryPolicy",
+    "RetryStats",
+    "RateLimiter",
+    "MemoryBucketStore",
+    "SQLiteBucketStore",
+    "RevisionCache",
+    "RecordCache",
+    "ConditionalCache",
+    "AsyncElink",
     # class types
     "Record",
     "Geolocation",
@@ -49,6 +72,14 @@ __all__ = (
     "Revision",
     "RevisionComparison",
     "Query",
+    "ParallelScan",
+    "BulkResult",
+    "ChangeJournal",
+    "SQLiteRecordStore",
+    "SQLiteKeyStore",
+    "RecordIndex",
+    "StatusReport",
+    "AsyncQuery",
     "AuditLog",
     # enumerations
     "AccessLimitation",
@@ -62,16 +93,27 @@ __all__ = (
     "set_api_token",
     "set_target_url",
     "get_single_record",
+    "get_records",
     "query_records",
+    "sync_records",
+    "wait_for_status",
     "post_new_record",
+    "post_new_records",
     "reserve_doi",
     "update_record",
+    "patch_changes",
+    "apply_changes",
     "get_revision_by_number",
     "get_revision_by_date",
+    "get_revisions_by_dates",
     "get_all_revisions",
+    "harvest_revisions",
     "compare_two_revisions",
+    "compare_revision_history",
     "get_media",
     "get_media_content",
+    "iter_media_content",
+    "download_media",
     "post_media",
     "put_media",
     "delete_single_media",
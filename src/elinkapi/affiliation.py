@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator, ValidationInfo
 from .utils import Validation
 from typing import Optional
 
@@ -22,7 +22,9 @@ class Affiliation(BaseModel):
 
     @field_validator("ror_id")
     @classmethod
-    def validate_ror_id(cls, value: str) -> str:
+    def validate_ror_id(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
         if value: 
             Validation.find_ror_value(value)
         return value
\ No newline at end of file
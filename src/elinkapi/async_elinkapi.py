@@ -0,0 +1,462 @@
+from urllib.parse import urlencode
+import os
+import mimetypes
+from .elinkapi import Elink
+from .exceptions import NotFoundException
+from .utils import Validation, dump_json, dump_model, open_destination
+from .async_query import AsyncQuery
+from .retry import RetryPolicy
+
+try:
+    import httpx
+    _AsyncBaseTransport = httpx.AsyncBaseTransport
+except ImportError:
+    httpx = None
+    _AsyncBaseTransport = object
+
+class _ElinkTransport(_AsyncBaseTransport):
+    """
+    httpx transport applying a RetryPolicy, and optionally a RateLimiter, around another
+    transport.  Per-request retry overrides are read from the "retry" and "deadline" request
+    extensions.
+    """
+    def __init__(self, transport, retry_policy, rate_limiter=None):
+        self.transport = transport
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+
+    async def _send(self, request):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(request.method, str(request.url))
+        return await self.transport.handle_async_request(request)
+
+    async def handle_async_request(self, request):
+        return await self.retry_policy.call_async(request.method,
+                                                  lambda: self._send(request),
+                                                  retry=request.extensions.get("retry"),
+                                                  deadline=request.extensions.get("deadline"),
+                                                  exceptions=(httpx.TransportError,))
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+class AsyncElink:
+    """
+    Asynchronous (asyncio) access points for E-Link API endpoints, mirroring Elink.
+
+    Requires the optional httpx dependency:
+    pip install elinkapi[async]
+
+    Construct in the same way as Elink; every API method is a coroutine.  A single pooled
+    httpx.AsyncClient is shared by all calls and AsyncQuery paging, so many requests may be
+    in flight at once over a bounded number of connections.
+
+    >>> from elinkapi import AsyncElink
+    >>> async with AsyncElink(token=MYUSERTOKEN) as api:
+    ...     records = await asyncio.gather(*[api.get_single_record(id) for id in osti_ids])
+    ...     async for record in await api.query_records(title="Science"):
+    ...         print (record.title)
+    """
+    # response conversion is shared with the synchronous connector
+    _convert_response_to_records = Elink._convert_response_to_records
+    _convert_response_to_media_info = Elink._convert_response_to_media_info
+    _convert_response_to_revision_history = Elink._convert_response_to_revision_history
+    _convert_response_to_revision_comparison = Elink._convert_response_to_revision_comparison
+    _convert_record = Elink._convert_record
+    set_api_token = Elink.set_api_token
+    set_target_url = Elink.set_target_url
+    record_to_dict = Elink.record_to_dict
+    record_to_json = Elink.record_to_json
+
+    def __init__(self, token=None, target=None, client=None, max_connections=100,
+                 max_keepalive_connections=20, keepalive_expiry=5.0, timeout=None, retry_policy=None,
+                 rate_limiter=None, trusted=False):
+        """
+        Set up the asynchronous E-Link 2 OSTI API connector.
+
+        Keyword Arguments:
+            token -- the user API token
+            target -- the E-Link API URL (default: production E-Link)
+            client -- an existing httpx.AsyncClient to use; if not provided, one is created
+                      from the connection limits, retry policy and rate limiter below
+            max_connections -- maximum number of concurrent connections (default: 100)
+            max_keepalive_connections -- maximum idle connections kept alive (default: 20)
+            keepalive_expiry -- seconds an idle connection is kept alive (default: 5.0)
+            timeout -- request timeout in seconds, or None for no timeout (default: None)
+            retry_policy -- RetryPolicy for transient failures (default: RetryPolicy())
+            rate_limiter -- RateLimiter pacing requests, or None for no pacing (default: None)
+            trusted -- skip the models' custom field checks on response data (default: False); see Elink
+        """
+        if httpx is None:
+            raise ImportError("AsyncElink requires the httpx package; install with 'pip install elinkapi[async]'.")
+
+        self.token = token
+        self.target = target or "https://www.osti.gov/elink2api/"
+        self.trusted = trusted
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        if client is None:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=max_connections,
+                                                                     max_keepalive_connections=max_keepalive_connections,
+                                                                     keepalive_expiry=keepalive_expiry))
+            client = httpx.AsyncClient(transport=_ElinkTransport(transport, self.retry_policy, self.rate_limiter),
+                                       timeout=timeout)
+        self.client = client
+
+    async def aclose(self):
+        """Release any pooled connections held by this connector."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    # Record Methods
+    async def get_single_record(self, osti_id: int):
+        """Obtain the metadata JSON for a record at OSTI.
+
+        >>> record = await api.get_single_record(2009785)
+
+        Arguments:
+            osti_id -- ID that uniquely identifies an E-link 2.0 Record
+
+        Returns:
+            Record - metadata of a single record
+        """
+        response = await self.client.get(f'{self.target}/records/{osti_id}',
+                                         headers = { "Authorization" : f"Bearer {self.token}"})
+        Validation.handle_response(response)
+
+        # returns array, so grab the first element
+        return self._convert_response_to_records(response)[0]
+
+    async def query_records(self, **kwargs):
+        """Query for records using a variety of query search parameters.
+
+        >>> query = await api.query_records(title="Science", product_type = "JA")
+        >>> async for record in query:
+        ...   print (record.title)
+
+        Arguments:
+            params -- See https://www.osti.gov/elink2api/#tag/records/operation/getRecords for
+                the list of allowed query parameters.
+
+        Returns:
+            an asynchronously iterable AsyncQuery object containing total_rows count matching the
+            search, and data containing a page at a time of returned Record values as a List.
+        """
+        query_params = ""
+
+        if(len(kwargs) > 0):
+            query_params = "?" + urlencode(kwargs, doseq=True)
+
+        response = await self.client.get(f"{self.target}/records{query_params}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        return AsyncQuery(response, target=self.target, token=self.token, client=self.client,
+                          trusted=self.trusted)
+
+    async def reserve_doi(self, r=None, **kwargs):
+        """ Save a Record with minimal validations.  See Elink.reserve_doi. """
+        return await self.post_new_record(r=r, **kwargs)
+
+    async def post_new_record(self, r=None, state="save", retry=False, **kwargs):
+        """Create a new metadata Record with OSTI.  See Elink.post_new_record, including
+        when to enable retry for this non-idempotent call.
+
+        Returns:
+            Record - metadata of a single record saved (or submitted) to E-Link 2.0
+        """
+        record = self._convert_record(record=r, **kwargs)
+        response = await self.client.post(f"{self.target}records/{state}",
+                                          headers={
+                                              "Authorization": f"Bearer {self.token}",
+                                              "Content-Type": "application/json"
+                                          },
+                                          content=dump_model(record),
+                                          extensions={"retry": retry})
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def patch_record(self, osti_id, patch, state="save"):
+        """
+        Update record via partial-patch-json method endpoint.  See Elink.patch_record.
+
+        Returns:
+            Record -- the metadata of the new record revision if successful
+        """
+        response = await self.client.patch(f"{self.target}/records/{osti_id}/{state}",
+                                           headers = {
+                                               "Authorization" : f"Bearer {self.token}",
+                                               "Content-Type": "application/json"
+                                           },
+                                           content=dump_json(patch))
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def patch_json(self, osti_id, jsonpatch, state="save"):
+        """
+        Update record via a JSON-patch set of command operations.  See Elink.patch_json.
+
+        Returns:
+            Record -- the metadata of the new revision with operations performed if successful
+        """
+        response = await self.client.patch(f"{self.target}/records/{osti_id}/{state}",
+                                           headers = {
+                                               "Authorization" : f"Bearer {self.token}",
+                                               "Content-Type": "application/json-patch+json"
+                                           },
+                                           content=dump_json(jsonpatch))
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def update_record(self, osti_id, r=None, state="save", **kwargs):
+        """Update (replace) existing records at OSTI by unique OSTI ID.  See Elink.update_record.
+
+        Returns:
+            Record - Metadata of record updated with the given information, creating a new revision
+        """
+        record = self._convert_record(record=r, **kwargs)
+        response = await self.client.put(f"{self.target}records/{osti_id}/{state}",
+                                         headers={
+                                             "Authorization": f"Bearer {self.token}",
+                                             "Content-Type": "application/json"
+                                         },
+                                         content=dump_model(record))
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def get_revision_by_number(self, osti_id, revision_number):
+        """Access specific revision number of a given OSTI ID
+
+        Returns:
+            Record - The metadata of the Record at the given revision number
+        """
+        response = await self.client.get(f"{self.target}records/revision/{osti_id}/at/{revision_number}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        if(response.status_code == 404):
+            raise NotFoundException("Requested record version is not on file.")
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def get_revision_by_date(self, osti_id, date):
+        """Access revision of metadata by OSTI ID that was active at the given date-time provided
+
+        Returns:
+            Record - The metadata of the Record on the given date
+        """
+        response = await self.client.get(f"{self.target}records/revision/{osti_id}/dated/{date}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        if(response.status_code == 404):
+            raise NotFoundException("Record version for specified date is not on file.")
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_records(response)[0]
+
+    async def get_all_revisions(self, osti_id):
+        """Obtain summary information of all given revisions of a metadata record by its OSTI ID
+
+        Returns:
+            RevisionHistory - All the metadata of the revisions of a record
+        """
+        response = await self.client.get(f"{self.target}records/revision/{osti_id}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_revision_history(response)
+
+    async def compare_two_revisions(self, osti_id, left, right):
+        """Compare values of two separate revisions of the same metadata record
+
+        Returns:
+            List[RevisionComparison]
+        """
+        response = await self.client.get(f"{self.target}records/revision/{osti_id}/compare/{left}/{right}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_revision_comparison(response)
+
+    async def delete_record(self, osti_id:int, reason:str) -> None:
+        """"
+        Delete a given metadata record from the system by its OSTI ID.  See Elink.delete_record.
+        """
+        response = await self.client.delete(f"{self.target}records/{osti_id}?reason={reason}",
+                                            headers = { "Authorization" : f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+    # Media Methods
+    async def get_media(self, osti_id):
+        """Get information about any media sets (files or URLs) associated with the OSTI ID
+
+        Returns:
+            List[MediaInfo] - info on all the media associated with the osti_id
+        """
+        response = await self.client.get(f'{self.target}media/{osti_id}',
+                                         headers = { "Authorization" : f"Bearer {self.token}" })
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_media_info(response)
+
+    async def get_media_content(self, media_file_id):
+        """Obtain content of a particular MEDIA FILE by its unique ID
+
+        Returns:
+            Binary string that is the content associated with the media_file_id
+        """
+        response = await self.client.get(f"{self.target}media/file/{media_file_id}",
+                                         headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        return response.content
+
+    async def iter_media_content(self, media_file_id, chunk_size=65536, progress=None):
+        """Obtain content of a particular MEDIA FILE by its unique ID a chunk at a time, as it is
+        received.  See Elink.iter_media_content.
+
+        Returns:
+            asynchronous iterator of byte strings
+        """
+        async with self.client.stream("GET", f"{self.target}media/file/{media_file_id}",
+                                      headers={"Authorization": f"Bearer {self.token}"}) as response:
+            if not response.is_success:
+                # read the error details
+                await response.aread()
+            Validation.handle_response(response)
+
+            length = response.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+            received = 0
+            async for chunk in response.aiter_bytes(chunk_size):
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+                yield chunk
+
+    async def download_media(self, media_file_id, dest, chunk_size=65536, progress=None):
+        """Save content of a particular MEDIA FILE by its unique ID to a file path or binary file
+        object, streaming it as it is received.  See Elink.download_media.
+
+        Returns:
+            int -- the number of bytes written
+        """
+        written = 0
+        with open_destination(dest) as file:
+            async for chunk in self.iter_media_content(media_file_id, chunk_size=chunk_size, progress=progress):
+                file.write(chunk)
+                written += len(chunk)
+        return written
+
+    async def _media_files(self, osti_id, file_path):
+        """
+        Construct the multipart "file" field for a media upload from a local path or http(s) URL.
+        Local files are streamed by httpx as the request is sent.
+        """
+        if file_path is None:
+            raise ValueError("File path is missing.")
+
+        filename = os.path.basename(file_path) or str(osti_id) + ".pdf"
+
+        if(file_path.startswith("http")):
+            source = await self.client.get(file_path)
+            return {'file': (filename, source.content, mimetypes.guess_type(filename)[0])}
+        else:
+            return {'file': (filename, open(file_path, 'rb'), mimetypes.guess_type(filename)[0])}
+
+    async def post_media(self, osti_id, file_path=None, title=None, stream=False, retry=False):
+        """Attach the media found at the given filepath to the record associated
+        with the given osti_id.  See Elink.post_media; uploads are always streamed.
+
+        Returns:
+            MediaInfo
+        """
+        files = await self._media_files(osti_id, file_path)
+        try:
+            response = await self.client.post(f'{self.target}media/{osti_id}',
+                                              headers = { "Authorization" : f"Bearer {self.token}"},
+                                              params = { "title": title } if title is not None else None,
+                                              files=files,
+                                              extensions={"retry": retry})
+        finally:
+            _close_files(files)
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_media_info(response)
+
+    async def put_media(self, osti_id, media_id, file_path=None, title=None, stream=False, retry=None):
+        """Replace a given media set with a new basis file.  See Elink.put_media; uploads
+        are always streamed.
+
+        Returns:
+            MediaInfo
+        """
+        files = await self._media_files(osti_id, file_path)
+        try:
+            response = await self.client.put(f'{self.target}media/{osti_id}/{media_id}',
+                                             headers = { "Authorization" : f"Bearer {self.token}"},
+                                             params = { "title": title } if title is not None else None,
+                                             files=files,
+                                             extensions={"retry": retry})
+        finally:
+            _close_files(files)
+
+        Validation.handle_response(response)
+
+        return self._convert_response_to_media_info(response)
+
+    async def delete_single_media(self, osti_id, media_id, reason):
+        """Disassociate an individual media set from this OSTI ID
+
+        Returns:
+            int - the total number of rows removed
+        """
+        response = await self.client.delete(f"{self.target}media/{osti_id}/{media_id}?reason={reason}",
+                                            headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        if(response.status_code == 204):
+            return int(response.headers['x-total-count'])
+
+    async def delete_all_media(self, osti_id, reason):
+        """Disassociate ALL media sets from this OSTI ID
+
+        Returns:
+            int - the total number of rows removed
+        """
+        response = await self.client.delete(f"{self.target}media/{osti_id}?reason={reason}",
+                                            headers={"Authorization": f"Bearer {self.token}"})
+
+        Validation.handle_response(response)
+
+        if(response.status_code == 204):
+            return int(response.headers['x-total-count'])
+
+def _close_files(files):
+    """ Close any local file handles opened for a media upload. """
+    for _, content, _ in files.values():
+        if hasattr(content, "close"):
+            content.close()
@@ -0,0 +1,97 @@
+from .query import Query
+from .utils import Validation
+
+class AsyncQuery:
+    """
+    Asynchronous counterpart of Query, produced by AsyncElink.query_records.  Contains
+    total count of records found, the data (List of Record objects) of the current page,
+    and links to next and/or previous pages as applicable.
+
+    AsyncQuery is asynchronously iterable, fetching further pages as needed.
+
+    .. code-block:: python
+        query = await api.query_records(title='Science report', product_type = 'TR')
+
+        async for record in query:
+            print (record.model_dump_json(exclude_none=True))
+
+        async for page in query.iter_pages():
+            await database.insert_many(page)
+    """
+    _response_to_records = Query._response_to_records
+    _read = Query._read
+    _apply = Query._apply
+    _load = Query._load
+    total_count = Query.total_count
+    has_next = Query.has_next
+    has_previous = Query.has_previous
+    _stream = False
+    _records = None
+    _trusted = False
+
+    def __init__(self, response, target=None, token=None, client=None, trusted=False):
+        """
+        Set up the object based on a given HTTP service response.  Subsequent pages
+        are requested through the given httpx.AsyncClient.  If trusted, the records
+        skip their custom field checks (see Elink).
+        """
+        self._trusted = trusted
+        self._load(response)
+        self._target = target
+        self._token = token
+        self._client = client
+
+    async def _get(self, url):
+        response = await self._client.get(f"{self._target}{url}",
+                                          headers = { "Authorization" : f"Bearer {self._token}"})
+        Validation.handle_response(response)
+        self._load(response)
+
+    async def previous(self):
+        if self.has_previous():
+            await self._get(self.previous_url)
+            return self
+        else:
+            raise StopAsyncIteration
+
+    async def reset(self):
+        """
+        Restarts the query object from first page of results if possible.  If no valid first page,
+        raise StopAsyncIteration.
+        """
+        if self.first_url:
+            await self._get(self.first_url)
+        else:
+            raise StopAsyncIteration
+
+    async def iter_pages(self):
+        """
+        Yield the results a page at a time, as lists of records.  See Query.iter_pages.
+        """
+        while True:
+            page = self.data[self._position:] if self._position else self.data
+            self._position = len(self.data)
+            if page:
+                yield page
+
+            if not self.has_next():
+                return
+            await self._get(self.next_url)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """
+        Return the next record in this AsyncQuery, if available.
+        Once this runs out of pages with results, it will raise StopAsyncIteration.
+        """
+        while self._position >= len(self.data):
+            if not self.has_next():
+                raise StopAsyncIteration
+            await self._get(self.next_url)
+
+        record = self.data[self._position]
+        self._position += 1
+
+        return record
@@ -0,0 +1,135 @@
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .exceptions import APIException, NotFoundException, ForbiddenException
+
+class BulkResult:
+    """
+    The outcome of one item of a bulk operation: either the resulting record, or the
+    error raised for it.
+
+    index -- position of the item in the input
+    item -- the input item (Record, dict, ...)
+    record -- the RecordResponse returned by the API, if successful
+    error -- the exception raised, if not: an APIException (such as a BadRequestException,
+             whose get_errors() gives the validation details) or a pydantic ValidationError
+             for input that is not a valid Record
+    """
+    def __init__(self, index, item, record=None, error=None):
+        self.index = index
+        self.item = item
+        self.record = record
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"record={self.record.osti_id}" if self.ok else f"error={type(self.error).__name__}"
+        return f"BulkResult(index={self.index}, {outcome})"
+
+def run_bulk(items, call, workers, ordered=False, in_flight=None, numbered=False, completed=None):
+    """
+    Apply call to each of the items on a pool of worker threads, yielding a BulkResult
+    for each.  Items are read from the iterable only as room becomes available, so at most
+    in_flight calls are pending at once and a generator input is never held in memory.
+
+    Arguments:
+        items -- iterable of inputs
+        call -- function of one input returning a record
+        workers -- number of worker threads
+
+    Keyword Arguments:
+        ordered -- yield results in input order rather than as they complete (default: False)
+        in_flight -- maximum calls submitted but not yet yielded (default: twice the workers)
+        numbered -- items are (index, item) pairs, such as row numbers of a file, rather than
+                    indexed by position (default: False)
+        completed -- function called with each BulkResult on its worker thread as soon as it
+                     completes, before it is yielded (default: None)
+
+    API errors and invalid input are reported in the results; any other exception (such as
+    a connection failure remaining after retries) stops the operation and is raised.
+    """
+    limit = max(1, in_flight or workers * 2)
+
+    def apply(index, item):
+        try:
+            result = BulkResult(index, item, record=call(item))
+        except (APIException, ValueError) as error:
+            result = BulkResult(index, item, error=error)
+        if completed is not None:
+            completed(result)
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque()
+    try:
+        for index, item in (items if numbered else enumerate(items)):
+            while len(pending) >= limit:
+                yield from _completed(pending, ordered)
+            pending.append(executor.submit(apply, index, item))
+
+        while pending:
+            yield from _completed(pending, ordered)
+    finally:
+        # let calls already sent finish, but start no more
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _completed(pending, ordered):
+    """ remove and return the results of finished calls, waiting for at least one."""
+    if ordered:
+        return [pending.popleft().result()]
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+    return [future.result() for future in done]
+
+def _batches(osti_ids, size):
+    """ (index, OSTI ID) pairs of the input, in lists of up to size."""
+    numbered = enumerate(osti_ids)
+    while True:
+        batch = list(itertools.islice(numbered, size))
+        if not batch:
+            return
+        yield batch
+
+def get_records(api, osti_ids, workers, ordered=True, in_flight=None, batch_size=0, cache=True):
+    """
+    Fetch the records with the given OSTI IDs concurrently, yielding a BulkResult for each.
+    See Elink.get_records.
+    """
+    if not batch_size:
+        return run_bulk(osti_ids, lambda osti_id: api.get_single_record(osti_id, cache=cache), workers,
+                        ordered=ordered, in_flight=in_flight)
+
+    def fetch(batch):
+        found = { record.osti_id: record
+                  for record in api.query_records(osti_id=[osti_id for _, osti_id in batch], rows=len(batch)) }
+
+        results = []
+        for index, osti_id in batch:
+            record = found.get(int(osti_id))
+            if record is None:
+                # not in the query results; find out whether it is missing or forbidden
+                try:
+                    record = api.get_single_record(osti_id, cache=cache)
+                except (NotFoundException, ForbiddenException) as error:
+                    results.append(BulkResult(index, osti_id, error=error))
+                    continue
+            results.append(BulkResult(index, osti_id, record=record))
+        return results
+
+    return _unbatched(run_bulk(_batches(osti_ids, batch_size), fetch, workers, ordered=ordered,
+                               in_flight=in_flight and max(1, in_flight // batch_size)))
+
+def _unbatched(results):
+    """ the results for each OSTI ID, from the results for each batch."""
+    for result in results:
+        if result.ok:
+            yield from result.record
+        else:
+            # the batch query itself failed
+            for index, osti_id in result.item:
+                yield BulkResult(index, osti_id, error=result.error)
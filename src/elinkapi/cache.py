@@ -0,0 +1,348 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import format_datetime
+
+class RevisionCache:
+    """
+    Persistent local cache of immutable E-Link revision data, kept in a SQLite database
+    file.  Once a revision of a record exists its content never changes, so Elink reads
+    through this cache for:
+
+    - get_revision_by_number: the record metadata at a given revision
+    - compare_two_revisions: the differences between two given revisions
+    - get_all_revisions: the revision history, once every revision in it is closed (has
+      a date_valid_end); a history still open to new revisions is always requested
+
+    Responses are stored as received, keyed by their request URL, so entries for review
+    and production targets are kept apart.  When the total size of stored responses
+    exceeds max_bytes, the least recently used entries are evicted.  Any of these calls
+    may bypass the cache with cache=False.
+
+    >>> api = Elink(token=MYUSERTOKEN, revision_cache=RevisionCache("/var/cache/elink-revisions.db"))
+    >>> api.get_revision_by_number(2008590, 3)                # requested, then stored
+    >>> api.get_revision_by_number(2008590, 3)                # read from the cache
+    >>> api.get_revision_by_number(2008590, 3, cache=False)   # requested regardless
+
+    Arguments:
+        path -- the database file; created if not present
+
+    Keyword Arguments:
+        max_bytes -- upper limit on the total size of stored responses (default: 256 MiB)
+        timeout -- seconds to wait for another process holding the database lock (default: 30)
+    """
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=30.0):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, body BLOB, size INTEGER, accessed REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key) -> bytes:
+        """ The stored response body for key, or None if not cached. """
+        connection = self._connection()
+        row = connection.execute("SELECT body FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key, body):
+        """ Store a response body for key, evicting least recently used entries if over max_bytes. """
+        if len(body) > self.max_bytes:
+            return
+
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("INSERT OR REPLACE INTO entries (key, body, size, accessed) VALUES (?, ?, ?, ?)",
+                               (key, body, len(body), time.time()))
+            excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self.max_bytes
+
+            evicted = []
+            if excess > 0:
+                for stored, size in connection.execute("SELECT key, size FROM entries WHERE key != ? ORDER BY accessed",
+                                                       (key,)):
+                    evicted.append((stored,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def discard(self, key):
+        """ Remove any entry for key. """
+        self._connection().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """ Remove all entries. """
+        self._connection().execute("DELETE FROM entries")
+
+    def size(self) -> int:
+        """ Total size in bytes of the stored responses. """
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+class RecordCache:
+    """
+    In-process cache of current record metadata and media information, for applications
+    that look up the same records repeatedly.  Elink reads get_single_record and get_media
+    through it, as well as the revision histories used by local revision-by-date lookups,
+    keeping at most maxsize entries (least recently used entries are evicted) for ttl
+    seconds each.
+
+    With stale_while_revalidate, an entry up to that many seconds past its ttl is still
+    returned at once, while a fresh copy is requested in a background thread; only
+    entries older than that wait for a request.
+
+    Calls through the same Elink that alter a record or its media (update_record,
+    patch_record, patch_json, post_media, put_media, delete_record, delete_single_media,
+    delete_all_media) discard its cached entries.  Changes made elsewhere are seen once
+    the entries expire.
+
+    Cached objects are shared between callers, and should be treated as read-only; use
+    model_copy(deep=True) to obtain a copy to modify.
+
+    >>> api = Elink(token=MYUSERTOKEN, record_cache=RecordCache(maxsize=5000, ttl=30, stale_while_revalidate=300))
+    >>> api.record_cache.as_dict()
+    {'hits': 4180, 'stale': 12, 'misses': 230, 'evictions': 0, 'invalidations': 3, 'size': 230}
+
+    Keyword Arguments:
+        maxsize -- maximum number of entries held (default: 1024)
+        ttl -- seconds an entry is fresh (default: 60)
+        stale_while_revalidate -- seconds past ttl an entry may be returned while it is refreshed (default: 0)
+    """
+    def __init__(self, maxsize=1024, ttl=60.0, stale_while_revalidate=0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        # advanced by each invalidation, so that loads begun before it are not stored
+        self._epoch = 0
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _store(self, key, value, epoch):
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _refresh(self, key, load, epoch):
+        try:
+            self._store(key, load(), epoch)
+        except Exception:
+            # keep serving the stale entry until it expires
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key, load):
+        """
+        The cached value for key, calling load() to obtain (and store) it if not cached or
+        expired.
+
+        Arguments:
+            key -- hashable identifying the entry
+            load -- callable returning the current value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored, value = entry
+                age = time.monotonic() - stored
+                if age <= self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                elif age <= self.ttl + self.stale_while_revalidate:
+                    self.stale += 1
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, load, self._epoch), daemon=True).start()
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            epoch = self._epoch
+
+        value = load()
+        self._store(key, value, epoch)
+        return value
+
+    def invalidate(self, *keys):
+        """ Discard the entries for the given keys, if cached. """
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        """ Discard all entries. """
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return { "hits": self.hits,
+                     "stale": self.stale,
+                     "misses": self.misses,
+                     "evictions": self.evictions,
+                     "invalidations": self.invalidations,
+                     "size": len(self._entries) }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class ConditionalCache:
+    """
+    Remembers the last response for each record, media and revision history lookup, so
+    that repeated lookups of unchanged data cost neither a full download nor rebuilding
+    the models.  Elink reads get_single_record, get_media and get_all_revisions through it.
+
+    Each lookup after the first is made conditional, sending If-None-Match with any ETag
+    received, and If-Modified-Since with any Last-Modified received (or, for a record,
+    its date_metadata_updated).  A 304 Not Modified response returns the models already
+    built.  If the server does not honour the conditions, a response body identical to
+    the last one (by digest) also returns the existing models instead of parsing again.
+
+    Returned objects are shared with later lookups of the same unchanged data, and should
+    be treated as read-only; use model_copy(deep=True) to obtain a copy to modify.
+
+    >>> api = Elink(token=MYUSERTOKEN, conditional_cache=ConditionalCache())
+    >>> api.conditional_cache.as_dict()
+    {'not_modified': 950, 'unchanged': 40, 'changed': 10, 'size': 25}
+
+    Keyword Arguments:
+        maxsize -- maximum number of lookups remembered; least recently used are forgotten (default: 4096)
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+
+    def conditions(self, key) -> dict:
+        """ Conditional request headers for the last response remembered for key. """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+
+        etag, last_modified, _, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def not_modified_value(self, key):
+        """ The value remembered for key, after a 304 response; None if no longer remembered. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.not_modified += 1
+            self._entries.move_to_end(key)
+            return entry[3]
+
+    def resolve(self, key, response, convert):
+        """
+        The value of a successful response for key: the remembered value if the body is
+        unchanged, otherwise convert(response), which is remembered with the response's
+        validators.
+        """
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[2] == digest:
+            value = entry[3]
+            with self._lock:
+                self.unchanged += 1
+        else:
+            value = convert(response)
+            with self._lock:
+                self.changed += 1
+
+        last_modified = response.headers.get("Last-Modified")
+        if not last_modified and getattr(value, "date_metadata_updated", None) is not None:
+            modified = value.date_metadata_updated
+            if modified.tzinfo is not None:
+                last_modified = format_datetime(modified.astimezone(timezone.utc), usegmt=True)
+
+        with self._lock:
+            self._entries[key] = (response.headers.get("ETag"), last_modified, digest, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys):
+        """ Forget the responses for the given keys. """
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """ Forget all responses. """
+        with self._lock:
+            self._entries.clear()
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return { "not_modified": self.not_modified,
+                     "unchanged": self.unchanged,
+                     "changed": self.changed,
+                     "size": len(self._entries) }
+
+    def __len__(self) -> int:
+        return len(self._entries)
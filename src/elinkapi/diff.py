@@ -0,0 +1,133 @@
+import difflib
+import json
+from pydantic import BaseModel
+from .revision_comparison import RevisionComparison
+
+def _document(value):
+    """ a model as the JSON document the API holds for it; dicts and lists are taken as is."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+def _pointer(path, key) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+def _size(operations) -> int:
+    return len(json.dumps(operations, separators=(",", ":")))
+
+def _diff(old, new, path, operations):
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dicts(old, new, path, operations)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_lists(old, new, path, operations)
+    else:
+        operations.append({ "op": "replace", "path": path, "value": new })
+
+def _diff_dicts(old, new, path, operations):
+    for key in old:
+        if key not in new:
+            operations.append({ "op": "remove", "path": _pointer(path, key) })
+    for key, value in new.items():
+        if key not in old:
+            operations.append({ "op": "add", "path": _pointer(path, key), "value": value })
+        else:
+            _diff(old[key], value, _pointer(path, key), operations)
+
+def _diff_lists(old, new, path, operations):
+    """
+    Changes to a list, by aligning its elements with difflib: unchanged runs of elements are
+    left alone, elements replaced one for one are patched in place, and the rest are removed
+    or inserted.  Blocks are worked from the end of the list backwards, so that the indexes
+    of each operation still hold once the later ones are applied.
+    """
+    # compare elements by their canonical JSON; elements may be unhashable dicts
+    keys = lambda items: [json.dumps(item, sort_keys=True, separators=(",", ":")) for item in items]
+    matcher = difflib.SequenceMatcher(None, keys(old), keys(new), autojunk=False)
+
+    changes = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        # elements present on both sides are patched in place
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for offset in range(paired):
+            _diff(old[i1 + offset], new[j1 + offset], _pointer(path, i1 + offset), changes)
+        for index in range(i2 - 1, i1 + paired - 1, -1):
+            changes.append({ "op": "remove", "path": _pointer(path, index) })
+        for index in range(j1 + paired, j2):
+            changes.append({ "op": "add", "path": _pointer(path, i1 + index - j1), "value": new[index] })
+
+    # replacing the whole list is occasionally smaller
+    replace = [{ "op": "replace", "path": path, "value": new }]
+    operations.extend(replace if _size(replace) < _size(changes) else changes)
+
+def make_patch(original, modified) -> list:
+    """
+    Compute a JSON patch (RFC 6902) turning one record into another, changing only what differs:
+    fields added, removed (set to None) or altered, down to individual values within nested lists
+    such as persons, organizations and identifiers.
+
+    >>> modified = record.model_copy(deep=True)
+    >>> modified.persons[1200].affiliations[0].name = "Oak Ridge National Laboratory"
+    >>> make_patch(record, modified)
+    [{'op': 'replace', 'path': '/persons/1200/affiliations/0/name', 'value': 'Oak Ridge National Laboratory'}]
+
+    Arguments:
+        original -- the record as it is (a Record or its dict)
+        modified -- the record as it should be (a Record or its dict)
+
+    Returns:
+        list of JSON patch operations, empty if the records are the same
+    """
+    operations = []
+    _diff(_document(original), _document(modified), "", operations)
+    return operations
+
+# top-level fields that differ between any two revisions, rather than being changes made in them
+REVISION_FIELDS = frozenset(["revision", "date_metadata_updated"])
+
+def _flatten(value, path, values):
+    """ collect the JSON pointer and text of each leaf value of a document, in document order."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, _pointer(path, key), values)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _flatten(item, _pointer(path, index), values)
+    elif value is not None:
+        values[path] = value if isinstance(value, str) else json.dumps(value)
+    return values
+
+def compare_records(left, right, exclude=None) -> list:
+    """
+    Compare two revisions of a record locally, in the form of Elink.compare_two_revisions: a
+    RevisionComparison for each value that differs, identified by its JSON pointer, with its
+    text on each side ("" where absent on that side).  List entries are compared by position.
+
+    >>> compare_records(api.get_revision_by_number(2009785, 1), api.get_revision_by_number(2009785, 2),
+    ...                 exclude=REVISION_FIELDS)
+    [RevisionComparison(pointer='/description', left='A custom description.', right='A NEW custom description.')]
+
+    Arguments:
+        left -- the first revision (a Record or its dict)
+        right -- the second revision (a Record or its dict)
+
+    Keyword Arguments:
+        exclude -- top-level field names not to compare (default: None)
+
+    Returns:
+        List[RevisionComparison] -- in order of the fields of left, then those only in right
+    """
+    left, right = _document(left), _document(right)
+    if exclude:
+        left = { key: value for key, value in left.items() if key not in exclude }
+        right = { key: value for key, value in right.items() if key not in exclude }
+
+    left_values, right_values = _flatten(left, "", {}), _flatten(right, "", {})
+    pointers = list(left_values) + [pointer for pointer in right_values if pointer not in left_values]
+
+    return [RevisionComparison(pointer=pointer, left=left_values.get(pointer, ""), right=right_values.get(pointer, ""))
+            for pointer in pointers
+            if left_values.get(pointer) != right_values.get(pointer)]
@@ -1,16 +1,43 @@
-import requests
 from urllib.parse import urlencode
-import json
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 from .exceptions import NotFoundException,ForbiddenException,UnauthorizedException,ServerException,ConflictException,BadRequestException
 from .record import Record, RecordResponse
 from .revision import Revision
 from .revision_comparison import RevisionComparison
 from .media_info import MediaInfo
-from .utils import Validation
+from .utils import Validation, dump_json, dump_model, open_destination
+from .parsing import PARSERS
 from .query import Query
+from .scan import ParallelScan
+from .sync import sync_records
+from .bulk import run_bulk, get_records
+from .pipeline import apply_changes
+from .diff import make_patch, compare_records, REVISION_FIELDS
+from .history import RevisionTimeline, harvest_revisions
+from .status import wait_for_status, RELEASED, FAILED
+from .session import ElinkSession
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .cache import RevisionCache, RecordCache, ConditionalCache
+from .keys import SQLiteKeyStore
+import functools
 import os
 import mimetypes
+import requests
+import time
+
+def _invalidates(method):
+    """
+    Mark an Elink method as altering the record (or its media) whose OSTI ID is its first
+    argument, discarding any cached copies once it has been called.
+    """
+    @functools.wraps(method)
+    def wrapper(self, osti_id, *args, **kwargs):
+        try:
+            return method(self, osti_id, *args, **kwargs)
+        finally:
+            self._invalidate_record(osti_id)
+    return wrapper
 
 class Elink:
     """
@@ -57,56 +84,136 @@ class Elink:
     >>> print (myrecord.doi)
 
     """
-    def __init__(self, token=None, target=None):
+    def __init__(self, token=None, target=None, session=None, pool_connections=10, pool_maxsize=10, 
+                 pool_block=False, keep_alive=True, retry_policy=None, rate_limiter=None, trusted=False,
+                 revision_cache=None, record_cache=None, conditional_cache=None, key_store=None):
         """
         Set up the E-Link 2 OSTI API connector.
+
+        All API calls, and paging through any Query obtained from this connector, share a single
+        pooled keep-alive HTTP session.
+
+        Keyword Arguments:
+            token -- the user API token
+            target -- the E-Link API URL (default: production E-Link)
+            session -- an existing ElinkSession to use; if not provided, one is created from the
+                       pool settings below
+            pool_connections -- number of distinct hosts to keep connection pools for (default: 10)
+            pool_maxsize -- maximum connections kept open per host (default: 10)
+            pool_block -- wait for a free pooled connection rather than opening extra ones (default: False)
+            keep_alive -- reuse connections between requests (default: True)
+            retry_policy -- RetryPolicy for transient failures; by default GET, PUT and DELETE
+                            calls are attempted up to 3 times (default: RetryPolicy())
+            rate_limiter -- RateLimiter pacing requests by endpoint class, or None for no pacing (default: None)
+            trusted -- treat response data as already validated by the server, skipping the models' custom
+                       field checks when reading it; types are still enforced (default: False)
+            revision_cache -- RevisionCache to read immutable revision data through, or None to always
+                              request it (default: None)
+            record_cache -- RecordCache to read current records and media information through, or None
+                            to always request them (default: None)
+            conditional_cache -- ConditionalCache making repeated record, media and revision history
+                                 lookups conditional requests, reusing unchanged results (default: None)
+            key_store -- SQLiteKeyStore recording the OSTI IDs of records created with idempotent=True by
+                         their site keys, or None to look for them on the server only (default: None)
         """
         self.token = token
+        self.trusted = trusted
+        self.revision_cache = revision_cache
+        self.record_cache = record_cache
+        self.conditional_cache = conditional_cache
+        self.key_store = key_store
         self.target = target or "https://www.osti.gov/elink2api/"
+        self.session = session or ElinkSession(pool_connections=pool_connections,
+                                               pool_maxsize=pool_maxsize,
+                                               pool_block=pool_block,
+                                               keep_alive=keep_alive)
+        if retry_policy is not None:
+            self.session.retry_policy = retry_policy
+        if rate_limiter is not None:
+            self.session.rate_limiter = rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """The RetryPolicy in effect, including its running stats counters."""
+        return self.session.retry_policy
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The RateLimiter pacing requests, if any."""
+        return self.session.rate_limiter
+
+    def close(self):
+        """Release any pooled connections held by this connector."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def _convert_response_to_records(self, response):
         """Returns array of Records"""
-        json_records = json.loads(response.text)
-        
-        if(not isinstance(json_records, list)):
-            json_records = [json_records]
-        records = [RecordResponse(**record) for record in json_records]
-        
-        return records
+        return PARSERS[RecordResponse].parse(response.content, trusted=self.trusted)
 
     def _convert_response_to_media_info(self, response):
         """returns array of media_info"""
-        return_val = []
-        all_media_info = json.loads(response.text)
-
-        """ ensure the API response is a singleton or array of media info. """
-        if isinstance(all_media_info, dict):
-            # singleton instance response
-            return_val.append(MediaInfo(**all_media_info))
-        else:
-            # array of objects
-            for media in all_media_info:
-                return_val.append(MediaInfo(**media))
-
-        return return_val
+        return PARSERS[MediaInfo].parse(response.content, trusted=self.trusted)
 
     def _convert_response_to_revision_history(self, response):
         """returns array of revision_history"""
-        all_history = json.loads(response.text)
-        
-        if(not isinstance(all_history, list)):
-            all_history = [all_history]
-        revisions = [Revision(**revision) for revision in all_history]
-        
-        return revisions
+        return PARSERS[Revision].parse(response.content, trusted=self.trusted)
 
     def _convert_response_to_revision_comparison(self, response):
         """returns array of revision_history"""
-        comparison = json.loads(response.text)
-        
-        revision_comparison = [RevisionComparison(**field_diff) for field_diff in comparison]
-        
-        return revision_comparison
+        return PARSERS[RevisionComparison].parse(response.content, trusted=self.trusted)
+
+    def _cached_revision_data(self, url, cache):
+        """Returns the response body for url held in the revision cache, if in use"""
+        if cache and self.revision_cache is not None:
+            return self.revision_cache.get(url)
+        return None
+
+    def _cache_revision_data(self, url, content, cache):
+        """Stores a response body for url in the revision cache, if in use"""
+        if cache and self.revision_cache is not None:
+            self.revision_cache.put(url, content)
+
+    def _cached_record_data(self, kind, osti_id, cache, load):
+        """Returns load() for the record, read through the record cache if in use"""
+        if cache and self.record_cache is not None:
+            return self.record_cache.get((self.target, kind, str(osti_id)), load)
+        return load()
+
+    def _invalidate_record(self, osti_id):
+        """Discards any cached copies of the record and its media"""
+        if self.record_cache is not None:
+            self.record_cache.invalidate(*[(self.target, kind, str(osti_id)) for kind in ("record", "media", "revisions")])
+        if self.conditional_cache is not None:
+            self.conditional_cache.invalidate(*[(self.target, kind, str(osti_id)) for kind in ("record", "media", "revisions")])
+
+    def _get_conditionally(self, kind, osti_id, url, convert):
+        """
+        Returns convert(response) of a GET of url, made as a conditional request if there is a
+        conditional cache, reusing its value for unchanged data
+        """
+        headers = { "Authorization" : f"Bearer {self.token}" }
+        if self.conditional_cache is None:
+            response = self.session.get(url, headers = headers)
+            Validation.handle_response(response)
+            return convert(response)
+
+        key = (self.target, kind, str(osti_id))
+        response = self.session.get(url, headers = dict(headers, **self.conditional_cache.conditions(key)))
+        if response.status_code == 304:
+            value = self.conditional_cache.not_modified_value(key)
+            if value is not None:
+                return value
+            # forgotten in the meantime; ask again
+            response = self.session.get(url, headers = headers)
+
+        Validation.handle_response(response)
+        return self.conditional_cache.resolve(key, response, convert)
 
     # Start of actual module methods that should be used.
     # Setup and helper functions
@@ -125,7 +232,7 @@ class Elink:
         return record.model_dump_json(exclude_none=True)
 
     # Record Methods
-    def get_single_record(self, osti_id: int):
+    def get_single_record(self, osti_id: int, cache=True):
         """Obtain the metadata JSON for a record at OSTI.
 
         >>> record = api.get_single_record(2009785)
@@ -134,17 +241,59 @@ class Elink:
         Arguments:
             osti_id -- ID that uniquely identifies an E-link 2.0 Record
 
+        Keyword Arguments:
+            cache -- read through the record cache, if one is configured (default: True)
+
         Returns:
             Record - metadata of a single record 
         """
-        response = requests.get(f'{self.target}/records/{osti_id}',
-                                headers = { "Authorization" : f"Bearer {self.token}"})
-        Validation.handle_response(response)
-        
-        # returns array, so grab the first element
-        return self._convert_response_to_records(response)[0]
+        def load():
+            # returns array, so grab the first element
+            return self._get_conditionally("record", osti_id, f'{self.target}/records/{osti_id}',
+                                           lambda response: self._convert_response_to_records(response)[0])
+
+        return self._cached_record_data("record", osti_id, cache, load)
+
+    def get_records(self, osti_ids, workers=4, ordered=True, in_flight=None, batch_size=0, cache=True):
+        """Obtain the metadata of many records at OSTI, requesting them concurrently
+
+        OSTI IDs are read from the iterable only as workers become free.  Records that are not on file
+        (NotFoundException) or not accessible (ForbiddenException) are reported in the results, with
+        any other API errors, rather than stopping the others.  Workers share the session's pooled
+        connections; more workers than its pool_maxsize open connections that are not kept.
+
+        With batch_size, the IDs are requested in groups of that many by a records query filtering on
+        all of them, rather than one request each; any ID the query does not return is then requested
+        alone, to tell whether it is missing or forbidden.
+
+        .. code-block:: python
+            for result in api.get_records(repository_ids, workers=8):
+                if result.ok:
+                    reconcile(result.record)
+                elif isinstance(result.error, NotFoundException):
+                    missing.append(result.item)
+                elif isinstance(result.error, ForbiddenException):
+                    forbidden.append(result.item)
 
-    def query_records(self, **kwargs):
+        Arguments:
+            osti_ids -- iterable of IDs that uniquely identify E-link 2.0 Records
+
+        Keyword Arguments:
+            workers -- number of requests in progress at once (default: 4)
+            ordered -- yield results in the order of the IDs rather than as they complete (default: True)
+            in_flight -- maximum IDs read but not yet yielded as results (default: twice the workers,
+                         in batches if batching)
+            batch_size -- number of IDs to request per records query, or 0 to request each record by
+                          itself (default: 0)
+            cache -- read individual records through the record cache, if one is configured (default: True)
+
+        Returns:
+            iterator of BulkResult -- for each ID (the item), its index, and either the record or the error
+        """
+        return get_records(self, osti_ids, workers, ordered=ordered, in_flight=in_flight,
+                           batch_size=batch_size, cache=cache)
+
+    def query_records(self, prefetch=0, workers=0, ordered=True, partitions=None, stream=False, **kwargs):
         """Query for records using a variety of query search parameters.
 
         Example:
@@ -158,21 +307,106 @@ class Elink:
             params -- See https://www.osti.gov/elink2api/#tag/records/operation/getRecords for 
                 the list of allowed query parameters. 
 
+        Keyword Arguments:
+            prefetch -- number of following pages to fetch and parse in the background while
+                        the current page is consumed; 0 to fetch each page on demand (default: 0)
+            workers -- if greater than zero, scan the results in partitions fetched concurrently by this
+                       many worker threads, returning a ParallelScan (default: 0)
+            ordered -- for parallel scans, yield records in partition order rather than as they arrive (default: True)
+            partitions -- for parallel scans, a list of dicts of additional query parameters each selecting a
+                          disjoint part of the results, such as date windows; by default pages are the partitions
+            stream -- decode and return records as each page's response arrives, holding only the record
+                      being read in memory; cannot be combined with prefetch or workers (default: False)
+
         Returns:
             a iterative Query object containing total_rows count matching the search, and data containing
-            a page at a time of returned Record values as a List.
+            a page at a time of returned Record values as a List; or a ParallelScan of the records if workers
+            are requested.
         """
+        if stream and (prefetch > 0 or workers > 0):
+            raise ValueError("Streamed queries cannot be prefetched or scanned in parallel.")
+
         query_params = ""
 
         if(len(kwargs) > 0):
-            query_params = "?" + urlencode(kwargs)
+            query_params = "?" + urlencode(kwargs, doseq=True)
 
-        response = requests.get(f"{self.target}/records{query_params}", 
-                                headers={"Authorization": f"Bearer {self.token}"})
+        response = self.session.get(f"{self.target}/records{query_params}", 
+                                    headers={"Authorization": f"Bearer {self.token}"},
+                                    stream=stream)
         
         Validation.handle_response(response)
 
-        return Query(response, target=self.target, token=self.token)
+        if workers > 0:
+            return ParallelScan(Query(response, target=self.target, token=self.token, session=self.session,
+                                      trusted=self.trusted),
+                                workers, ordered=ordered, partitions=partitions, api=self, parameters=kwargs)
+
+        return Query(response, target=self.target, token=self.token, session=self.session, prefetch=prefetch,
+                     stream=stream, trusted=self.trusted)
+
+    def wait_for_status(self, osti_ids, targets=RELEASED, failures=FAILED, timeout=None, interval=5.0,
+                        min_interval=1.0, max_interval=60.0, batch_size=100):
+        """Wait for records to reach a target workflow status, such as after submitting them
+
+        The records are polled by records queries filtering on up to batch_size OSTI IDs each, rather
+        than a request per record, until each has reached a target or failure status, or the time runs
+        out.  The interval between polls shortens while statuses are changing and lengthens while they
+        are not.  Records reaching a failure status are reported with their audit logs.  Records a query
+        does not return are looked up individually, and reported missing once not on file or not accessible.
+
+        >>> report = api.wait_for_status([2009785, 2009786, 2009787], timeout=1800)
+        >>> report
+        StatusReport(completed=2, failed=1, timed_out=0, missing=0, polls=14)
+        >>> report.audit_logs(2009787)
+
+        Arguments:
+            osti_ids -- IDs of the records to watch
+
+        Keyword Arguments:
+            targets -- WorkflowStatus values (or their codes) to wait for (default: Released)
+            failures -- WorkflowStatus values (or their codes) that will not reach a target
+                        (default: FailedValidation, FailedRelease)
+            timeout -- seconds to wait, or None to wait until every record is done (default: None)
+            interval -- seconds between the first polls (default: 5)
+            min_interval -- shortest interval between polls (default: 1)
+            max_interval -- longest interval between polls (default: 60)
+            batch_size -- OSTI IDs per records query (default: 100)
+
+        Returns:
+            StatusReport -- the completed, failed, timed out and missing records
+        """
+        return wait_for_status(self, osti_ids, targets=targets, failures=failures, timeout=timeout,
+                               interval=interval, min_interval=min_interval, max_interval=max_interval,
+                               batch_size=batch_size)
+
+    def sync_records(self, store, since=None, **filters):
+        """Bring a local store of records up to date with those matching the given query filters,
+        reading only the records updated since its last synchronization.
+
+        Records are read in order of their date_metadata_updated, and stored in batches along with
+        a watermark of how far the query has been read (kept per set of filters), so that a later
+        call, or one resuming an interrupted run, requests only what has changed since.  Records
+        deleted at OSTI are not removed from the store.
+
+        >>> store = SQLiteRecordStore("site-records.db")
+        >>> api.sync_records(store, site_ownership_code="LLNL")      # first run: every record
+        48210
+        >>> api.sync_records(store, site_ownership_code="LLNL")      # later runs: changes only
+        37
+
+        Arguments:
+            store -- the record store, such as a SQLiteRecordStore
+
+        Keyword Arguments:
+            since -- read records updated from this datetime (or ISO date-time string) instead of
+                     from the stored watermark; naive values are taken as UTC (default: None)
+            filters -- query parameters selecting the records to keep; see query_records
+
+        Returns:
+            int -- the number of records stored
+        """
+        return sync_records(self, store, since=since, **filters)
 
     def reserve_doi(self, r=None, **kwargs):
         """ Save a Record with minimal validations. 
@@ -223,35 +457,145 @@ class Elink:
         else:
             return Record(**kwargs)
 
-    def post_new_record(self, r=None, state="save", **kwargs):
+    def post_new_record(self, r=None, state="save", retry=False, idempotent=False, **kwargs):
         """Create a new metadata Record with OSTI
 
+        With idempotent=True, the record is created only if no record exists for its site key (its
+        site_ownership_code and site_unique_id): the key store, if any, and then the server are checked
+        before each attempt, and an existing record is returned instead.  Transient failures are then
+        retried per the retry policy, so a submission whose response was lost is never duplicated.
+
         Arguments:
             record -- Metadata record that you wish to send ("save" or "submit") to E-Link 2.0. May provide as 
                       Record or dict, or as keyword arguments.
 
         Keyword Arguments:
             state -- The desired submission state of the record ("save" or "submit")  (default: {"save"})
+            retry -- retry transient failures per the retry policy; POST is not idempotent, so only enable
+                     this where a repeated submission is safe, e.g. records carrying a site_unique_id (default: False)
+            idempotent -- create the record only if none exists for its site key, which the record must
+                          carry; retries transient failures (default: False)
             if record not provided, takes rest of keyword arguments to construct a Record
 
         Returns:
-            Record - metadata of a single record saved (or submitted) to E-Link 2.0
+            Record - metadata of a single record saved (or submitted) to E-Link 2.0, or the record already
+                     created for its site key
         """
         # make a Record from provided arguments
         record = self._convert_record(record=r, **kwargs)
+
+        if idempotent:
+            return self._post_idempotently(record, state)
+
         # post it as a new record
-        response = requests.post(f"{self.target}records/{state}", 
+        response = self._post_record(record, state, retry)
+
+        Validation.handle_response(response)
+
+        # returns array, so grab the first element
+        return self._convert_response_to_records(response)[0] 
+
+    def _post_record(self, record, state, retry):
+        return self.session.post(f"{self.target}records/{state}", 
                                  headers={
                                      "Authorization": f"Bearer {self.token}", 
                                      "Content-Type": "application/json" 
                                     }, 
-                                 json=json.loads(record.model_dump_json(exclude_none=True)))
+                                 data=dump_model(record),
+                                 retry=retry)
+
+    def _find_created(self, site_ownership_code, site_unique_id):
+        """ The record created for a site key, found in the key store or on the server; None if there is none. """
+        if self.key_store is not None:
+            osti_id = self.key_store.get(self.target, site_ownership_code, site_unique_id)
+            if osti_id is not None:
+                try:
+                    return self.get_single_record(osti_id)
+                except NotFoundException:
+                    # deleted since it was recorded
+                    self.key_store.discard(self.target, site_ownership_code, site_unique_id)
+
+        for record in self.query_records(site_ownership_code=site_ownership_code, site_unique_id=site_unique_id):
+            # the query may match more loosely than the key
+            if record.site_ownership_code == site_ownership_code and record.site_unique_id == site_unique_id:
+                if self.key_store is not None:
+                    self.key_store.put(self.target, site_ownership_code, site_unique_id, record.osti_id)
+                return record
+        return None
+
+    def _post_idempotently(self, record, state):
+        """ Create the record unless one exists for its site key, looking again before each retry."""
+        if not record.site_ownership_code or not record.site_unique_id:
+            raise ValueError("Idempotent record creation requires a site_ownership_code and site_unique_id.")
+
+        policy = self.session.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        policy.stats._add(calls=1)
+
+        while True:
+            existing = self._find_created(record.site_ownership_code, record.site_unique_id)
+            if existing is not None:
+                return existing
+
+            attempt += 1
+            policy.stats._add(attempts=1)
+            try:
+                response = self._post_record(record, state, retry=False)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                delay = policy.next_delay("POST", attempt, started, retry=True, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = policy.next_delay("POST", attempt, started, retry=True, response=response)
+                if delay is None:
+                    Validation.handle_response(response)
+                    if attempt > 1:
+                        policy.stats._add(recovered=1)
+
+                    created = self._convert_response_to_records(response)[0]
+                    if self.key_store is not None:
+                        self.key_store.put(self.target, record.site_ownership_code, record.site_unique_id,
+                                           created.osti_id)
+                    return created
+                response.close()
+
+            time.sleep(delay)
+
+    def post_new_records(self, records, workers=4, state="save", ordered=False, in_flight=None, retry=False,
+                         idempotent=False):
+        """Create many new metadata Records with OSTI, submitting them concurrently
+
+        Records are read from the iterable only as workers become free, so a generator of any
+        length may be given without holding it all in memory.  Each submission succeeds or fails
+        on its own; failures are reported in the results rather than stopping the others.
+
+        .. code-block:: python
+            for result in api.post_new_records(read_records(path), workers=8):
+                if result.ok:
+                    print(result.index, result.record.osti_id)
+                else:
+                    print(result.index, result.error.get_errors())
 
-        Validation.handle_response(response)
+        Arguments:
+            records -- iterable of Records (or dicts) to create
 
-        # returns array, so grab the first element
-        return self._convert_response_to_records(response)[0] 
+        Keyword Arguments:
+            workers -- number of submissions in progress at once (default: 4)
+            state -- The desired submission state of the records ("save" or "submit")  (default: {"save"})
+            ordered -- yield results in the order of the input rather than as completed (default: False)
+            in_flight -- maximum records read but not yet yielded as results (default: twice the workers)
+            retry -- retry transient failures per the retry policy; see post_new_record (default: False)
+            idempotent -- create each record only if none exists for its site key; see post_new_record (default: False)
+
+        Returns:
+            iterator of BulkResult -- for each input, its index, and either the created record or the error
+        """
+        return run_bulk(records,
+                        lambda record: self.post_new_record(record, state=state, retry=retry, idempotent=idempotent),
+                        workers, ordered=ordered, in_flight=in_flight)
     
+    @_invalidates
     def patch_record(self, osti_id, patch, state="save"):
         """
         Update record via partial-patch-json method endpoint.  Provide only the JSON you wish to alter.
@@ -268,17 +612,18 @@ class Elink:
         Returns:
             Record -- the metadata of the new record revision if successful
         """
-        response = requests.patch(f"{self.target}/records/{osti_id}/{state}",
+        response = self.session.patch(f"{self.target}/records/{osti_id}/{state}",
                         headers = { 
                             "Authorization" : f"Bearer {self.token}",
                             "Content-Type": "application/json"
                         },
-                        data=str(patch))
+                        data=dump_json(patch))
         
         Validation.handle_response(response)
 
         return self._convert_response_to_records(response)[0]
     
+    @_invalidates
     def patch_json(self, osti_id, jsonpatch, state="save"):
         """
         Update record via a JSON-patch set of command operations.  Note the jsonpatch is intended to be
@@ -297,17 +642,87 @@ class Elink:
         Returns:
             Record -- the metadata of the new revision with operations performed if successful
         """
-        response = requests.patch(f"{self.target}/records/{osti_id}/{state}",
-                                  headers = {
-                                      "Authorization" : f"Bearer {self.token}",
-                                      "Content-Type": "application/json-patch+json"
-                                  },
-                                  data=json.dumps(jsonpatch))
+        response = self.session.patch(f"{self.target}/records/{osti_id}/{state}",
+                                      headers = {
+                                          "Authorization" : f"Bearer {self.token}",
+                                          "Content-Type": "application/json-patch+json"
+                                      },
+                                      data=dump_json(jsonpatch))
         
         Validation.handle_response(response)
 
         return self._convert_response_to_records(response)[0]
 
+    def patch_changes(self, original, modified, state="save"):
+        """
+        Update a record with only the changes made to it, sent as a minimal JSON patch (see patch_json)
+        computed by comparing the record as it was with the modified copy.  Changes within nested lists
+        such as persons, organizations or identifiers are sent as changes to the affected entries, so a
+        small edit to a large record sends a small request.
+
+        >>> record = api.get_single_record(2009785)
+        >>> modified = record.model_copy(deep=True)
+        >>> modified.persons[1200].orcid = "0000-0002-1825-0097"
+        >>> api.patch_changes(record, modified)
+
+        Arguments:
+            original -- the record as obtained from OSTI (RecordResponse)
+            modified -- the record with the desired changes (Record or dict)
+
+        Keyword Arguments:
+            state -- The desired submission state of the record ("save" or "submit")  (default: {"save"})
+
+        Returns:
+            Record - metadata of the record with the changes applied; the original, without a request, if
+                     there are no changes
+        """
+        patch = make_patch(original, modified)
+        if not patch:
+            return original
+
+        return self.patch_json(original.osti_id, patch, state=state)
+
+    def apply_changes(self, changes, journal=None, name=None, format=None, workers=4, state="save",
+                      ordered=False, in_flight=None, retry_failed=False):
+        """Apply the record changes in an NDJSON or CSV file, sending them concurrently
+
+        The file is read a row at a time, and only as workers become free, so files of any size may be
+        applied without holding them in memory.  Each row names its record by "osti_id", and is sent by:
+
+        - update_record, for an NDJSON object without "patch": it replaces the record
+        - patch_json, for a "patch" that is a list of JSON-patch operations
+        - patch_record, for a "patch" that is an object, or for a CSV row without a "patch" column, whose
+          other non-empty columns are the values to change
+
+        With a journal, the outcome of each row is recorded as it completes, and rows already recorded are
+        skipped, so an interrupted run may simply be started again.
+
+        .. code-block:: python
+            journal = ChangeJournal("changes.journal.db")
+            for result in api.apply_changes("changes.ndjson", journal=journal, workers=8):
+                if not result.ok:
+                    print(f"row {result.index}: {result.error}")
+
+        Arguments:
+            changes -- path of the change file, or a text file object
+
+        Keyword Arguments:
+            journal -- a ChangeJournal recording the rows applied, for resuming (default: None)
+            name -- the name of the file in the journal; defaults to its absolute path
+            format -- "ndjson" or "csv"; by default "csv" for files ending .csv, otherwise "ndjson"
+            workers -- number of changes in progress at once (default: 4)
+            state -- The desired submission state of the records ("save" or "submit")  (default: {"save"})
+            ordered -- yield results in file order rather than as completed (default: False)
+            in_flight -- maximum rows read but not yet yielded as results (default: twice the workers)
+            retry_failed -- send again rows the journal records as failed (default: False)
+
+        Returns:
+            iterator of BulkResult -- for each row sent, its row number, the row, and either the changed record or the error
+        """
+        return apply_changes(self, changes, journal=journal, name=name, format=format, workers=workers,
+                             state=state, ordered=ordered, in_flight=in_flight, retry_failed=retry_failed)
+
+    @_invalidates
     def update_record(self, osti_id, r=None, state="save", **kwargs):
         """Update existing records at OSTI by unique OSTI ID.  Note this REPLACES the record entirely;
         the provided record details will become the new revision of the record on file; all required
@@ -327,53 +742,80 @@ class Elink:
         # get a record
         record = self._convert_record(record=r, **kwargs)
         # send the UPDATE
-        response = requests.put(f"{self.target}records/{osti_id}/{state}", 
-                                headers={
-                                    "Authorization": f"Bearer {self.token}"
-                                }, 
-                                json=json.loads(record.model_dump_json(exclude_none=True)))
+        response = self.session.put(f"{self.target}records/{osti_id}/{state}", 
+                                    headers={
+                                        "Authorization": f"Bearer {self.token}",
+                                        "Content-Type": "application/json"
+                                    }, 
+                                    data=dump_model(record))
 
         Validation.handle_response(response)
         
         # returns array, so grab the first element
         return self._convert_response_to_records(response)[0]
 
-    def get_revision_by_number(self, osti_id, revision_number):
+    def get_revision_by_number(self, osti_id, revision_number, cache=True):
         """Access specific revision number of a given OSTI ID
 
         Arguments:
             osti_id -- ID that uniquely identifies an E-link 2.0 Record
             revision_number -- The specific revision number to retrieve
 
+        Keyword Arguments:
+            cache -- read through the revision cache, if one is configured (default: True)
+
         Returns:
             Record - The metadata of the Record at the given revision number
         """
-        response = requests.get(f"{self.target}records/revision/{osti_id}/at/{revision_number}", 
-                                headers={
-                                    "Authorization": f"Bearer {self.token}"
-                                })
-        
-        # Special case on this exception -> Get 404's when date is before record creation
-        if(response.status_code == 404): 
-            raise NotFoundException("Requested record version is not on file.")
+        url = f"{self.target}records/revision/{osti_id}/at/{revision_number}"
+        content = self._cached_revision_data(url, cache)
+
+        if content is None:
+            response = self.session.get(url, 
+                                        headers={
+                                            "Authorization": f"Bearer {self.token}"
+                                        })
+            
+            # Special case on this exception -> Get 404's when date is before record creation
+            if(response.status_code == 404): 
+                raise NotFoundException("Requested record version is not on file.")
 
-        Validation.handle_response(response)
+            Validation.handle_response(response)
+            content = response.content
+            self._cache_revision_data(url, content, cache)
 
         # returns array, so grab the first element
-        return self._convert_response_to_records(response)[0]
+        return PARSERS[RecordResponse].parse(content, trusted=self.trusted)[0]
 
-    def get_revision_by_date(self, osti_id, date):
+    def get_revision_by_date(self, osti_id, date, local=False, cache=True):
         """Access revision of metadata by OSTI ID that was active at the given date-time provided
 
+        With local=True, the revision in effect is found here from the record's revision history (see
+        RevisionTimeline), and its metadata obtained by get_revision_by_number, so that with a revision
+        cache only revisions not seen before are requested.  The history is kept in the record cache, if
+        one is configured.  See also get_revisions_by_dates.
+
         Arguments:
             osti_id -- ID that uniquely identifies an E-link 2.0 Record
             date -- Date on which you wish to search for a revision of a Record
 
+        Keyword Arguments:
+            local -- find the revision from the revision history rather than by a dated request; the date
+                     may then be a datetime, date or ISO string, naive values (and dates, at midnight) being
+                     taken as UTC (default: False)
+            cache -- for local lookups, read through the record and revision caches, if configured (default: True)
+
         Returns:
             Record - The metadata of the Record on the given date
         """
-        response = requests.get(f"{self.target}records/revision/{osti_id}/dated/{date}", 
-                                headers={"Authorization": f"Bearer {self.token}"})
+        if local:
+            revision = RevisionTimeline(self._revision_history(osti_id, cache)).at(date)
+            if revision is None:
+                raise NotFoundException("Record version for specified date is not on file.")
+            return self.get_revision_by_number(osti_id, revision.revision, cache=cache)
+
+        response = self.session.get(f"{self.target}records/revision/{osti_id}/dated/{date}", 
+                                    headers={"Authorization": f"Bearer {self.token}"})
 
         # Special case on this exception -> Get 404's when date is before record creation
         if(response.status_code == 404): 
@@ -384,23 +826,103 @@ class Elink:
         # returns array, so grab the first element
         return self._convert_response_to_records(response)[0]
 
-    def get_all_revisions(self, osti_id):
+    def get_revisions_by_dates(self, osti_id, dates, cache=True):
+        """Access the revisions of metadata by OSTI ID that were active at each of the given date-times
+
+        The record's revision history is requested once, the revision in effect at each date found from
+        it (see RevisionTimeline), and each distinct revision's metadata obtained once, by
+        get_revision_by_number, rather than making a request per date.
+
+        >>> records = api.get_revisions_by_dates(2009785, [date(2023, 1, 1), date(2024, 1, 1), date(2025, 1, 1)])
+        >>> [record.revision if record else None for record in records.values()]
+        [None, 2, 2]
+
+        Arguments:
+            osti_id -- ID that uniquely identifies an E-link 2.0 Record
+            dates -- datetimes, dates or ISO strings; naive values (and dates, at midnight) are taken as UTC
+
+        Keyword Arguments:
+            cache -- read through the record and revision caches, if configured (default: True)
+
+        Returns:
+            dict -- each given date, mapped to the metadata of the Record on that date, or None if it had
+                    no revision on file then
+        """
+        timeline = RevisionTimeline(self._revision_history(osti_id, cache))
+
+        records = {}
+        found = {}
+        for date in dates:
+            revision = timeline.at(date)
+            if revision is not None and revision.revision not in records:
+                records[revision.revision] = self.get_revision_by_number(osti_id, revision.revision, cache=cache)
+            found[date] = records[revision.revision] if revision is not None else None
+        return found
+
+    def _revision_history(self, osti_id, cache):
+        """Returns the revisions of the record, read through the record cache if in use"""
+        return self._cached_record_data("revisions", osti_id, cache,
+                                        lambda: self.get_all_revisions(osti_id, cache=cache))
+
+    def get_all_revisions(self, osti_id, cache=True):
         """Obtain summary information of all given revisions of a metadata record by its OSTI ID
 
         Arguments:
             osti_id -- ID that uniquely identifies an E-link 2.0 Record
 
+        Keyword Arguments:
+            cache -- read through the revision cache, if one is configured; only histories whose
+                     revisions are all closed are cached (default: True)
+
         Returns:
             RevisionHistory - All the metadata of the revisions of a record
         """
-        response = requests.get(f"{self.target}records/revision/{osti_id}", 
-                                headers={"Authorization": f"Bearer {self.token}"})
+        url = f"{self.target}records/revision/{osti_id}"
+        content = self._cached_revision_data(url, cache)
+        if content is not None:
+            return PARSERS[Revision].parse(content, trusted=self.trusted)
+
+        def convert(response):
+            revisions = self._convert_response_to_revision_history(response)
+            # a history with an open (current) revision may still grow
+            if revisions and all(revision.date_valid_end is not None for revision in revisions):
+                self._cache_revision_data(url, response.content, cache)
+            return revisions
+
+        return self._get_conditionally("revisions", osti_id, url, convert)
+
+    def harvest_revisions(self, records, workers=8, cache=True, on_error=None):
+        """Obtain every revision of many metadata records, requesting them concurrently
+
+        Revision histories (get_all_revisions) and the metadata of each revision (get_revision_by_number)
+        are requested on a pool of workers, at most that many requests at a time, and each revision
+        yielded as it arrives.  Revisions of records already started are requested before further records
+        are started, so records are read from the iterable only as needed.
+
+        .. code-block:: python
+            failures = []
+            for osti_id, revision, record in api.harvest_revisions(api.query_records(site_ownership_code="LLNL"),
+                                                                   workers=16,
+                                                                   on_error=lambda *failure: failures.append(failure)):
+                audit.store(osti_id, revision.revision, revision.date_valid_start, record)
 
-        Validation.handle_response(response)
-        
-        return self._convert_response_to_revision_history(response)
+        Arguments:
+            records -- iterable of OSTI IDs, or of records (such as a Query) whose revisions are wanted
+
+        Keyword Arguments:
+            workers -- number of requests in progress at once (default: 8)
+            cache -- read through the revision and conditional caches, if configured (default: True)
+            on_error -- function called with (osti_id, Revision or None for the history, exception) for each
+                        request failing with an API error, such as a NotFoundException; if None, the error is
+                        raised, ending the harvest (default: None)
+
+        Returns:
+            iterator of (osti_id, Revision, RecordResponse) -- each revision's summary and metadata, in order
+            of arrival
+        """
+        return harvest_revisions(self, records, workers, cache=cache, on_error=on_error)
 
-    def compare_two_revisions(self, osti_id, left, right):
+    def compare_two_revisions(self, osti_id, left, right, cache=True, local=False):
         """Compare values of two separate revisions of the same metadata record
 
         Arguments:
@@ -408,33 +930,79 @@ class Elink:
             left -- The first revision number to retrieve and compare
             right -- The second revision number to retrieve and compare
 
+        Keyword Arguments:
+            cache -- read through the revision cache, if one is configured (default: True)
+            local -- compare the two revisions here (see diff.compare_records), from their metadata obtained
+                     through get_revision_by_number, rather than by a comparison request (default: False)
+
         Returns:
             List[RevisionComparison]
         """
-        response = requests.get(f"{self.target}records/revision/{osti_id}/compare/{left}/{right}", 
-                                headers={"Authorization": f"Bearer {self.token}"})
+        if local:
+            return compare_records(self.get_revision_by_number(osti_id, left, cache=cache),
+                                   self.get_revision_by_number(osti_id, right, cache=cache),
+                                   exclude=REVISION_FIELDS)
 
-        Validation.handle_response(response)
+        url = f"{self.target}records/revision/{osti_id}/compare/{left}/{right}"
+        content = self._cached_revision_data(url, cache)
+
+        if content is None:
+            response = self.session.get(url, 
+                                        headers={"Authorization": f"Bearer {self.token}"})
+
+            Validation.handle_response(response)
+            content = response.content
+            self._cache_revision_data(url, content, cache)
         
-        return self._convert_response_to_revision_comparison(response)
+        return PARSERS[RevisionComparison].parse(content, trusted=self.trusted)
 
+    def compare_revision_history(self, osti_id, cache=True):
+        """Compare each revision of a metadata record with the one before it, locally
+
+        Each revision's metadata is obtained once (through the revision cache, if one is configured), and
+        each adjacent pair compared here as by compare_two_revisions(local=True), rather than making a
+        comparison request per pair.
+
+        >>> for left, right, changes in api.compare_revision_history(2009785):
+        ...     print(left, right, [change.pointer for change in changes])
+
+        Arguments:
+            osti_id -- ID that uniquely identifies an E-link 2.0 Record
+
+        Keyword Arguments:
+            cache -- read through the revision cache, if one is configured (default: True)
+
+        Returns:
+            list of (left revision number, right revision number, List[RevisionComparison]), in revision order
+        """
+        numbers = sorted(revision.revision for revision in self.get_all_revisions(osti_id, cache=cache))
+
+        comparisons = []
+        previous = None
+        for number in numbers:
+            current = self.get_revision_by_number(osti_id, number, cache=cache)
+            if previous is not None:
+                comparisons.append((previous.revision, number,
+                                    compare_records(previous, current, exclude=REVISION_FIELDS)))
+            previous = current
+        return comparisons
 
     # Media Methods
-    def get_media(self, osti_id):
+    def get_media(self, osti_id, cache=True):
         """Get information about any media sets (files or URLs) associated with the OSTI ID
 
         Keyword Arguments:
             osti_id -- ID that uniquely identifies an E-link 2.0 Record 
+            cache -- read through the record cache, if one is configured (default: True)
 
         Returns:
             List[MediaInfo] - info on all the media associated with the osti_id
         """
-        response = requests.get(f'{self.target}media/{osti_id}',
-                                headers = { "Authorization" : f"Bearer {self.token}" })
-        
-        Validation.handle_response(response)
-        
-        return self._convert_response_to_media_info(response)
+        def load():
+            return self._get_conditionally("media", osti_id, f'{self.target}media/{osti_id}',
+                                           self._convert_response_to_media_info)
+
+        return self._cached_record_data("media", osti_id, cache, load)
 
     def get_media_content(self, media_file_id):
         """Obtain content stream of a particular MEDIA FILE by its unique ID
@@ -445,14 +1013,81 @@ class Elink:
         Returns:
             Binary string that is the content associated with the media_file_id
         """
-        response = requests.get(f"{self.target}media/file/{media_file_id}", 
-                                headers={"Authorization": f"Bearer {self.token}"})
+        response = self.session.get(f"{self.target}media/file/{media_file_id}", 
+                                    headers={"Authorization": f"Bearer {self.token}"})
 
         Validation.handle_response(response)
         
         return response.content
 
-    def post_media(self, osti_id, file_path=None, title=None, stream=False):
+    def iter_media_content(self, media_file_id, chunk_size=65536, progress=None):
+        """Obtain content of a particular MEDIA FILE by its unique ID a chunk at a time, as it is received,
+        without holding the whole file in memory
+
+        The request is made when iteration begins.
+
+        >>> for chunk in api.iter_media_content(1900, progress=lambda received, total: print(received, total)):
+        ...     archive.write(chunk)
+
+        Arguments:
+            media_file_id -- ID that uniquely identifies a media file associated with an E-Link 2.0 Record
+
+        Keyword Arguments:
+            chunk_size -- maximum bytes per chunk (default: 64 KiB)
+            progress -- function called after each chunk with the bytes received so far, and the total
+                        size if the server reports it (otherwise None) (default: None)
+
+        Returns:
+            iterator of byte strings, the content associated with the media_file_id
+        """
+        response = self.session.get(f"{self.target}media/file/{media_file_id}", 
+                                    headers={"Authorization": f"Bearer {self.token}"},
+                                    stream=True)
+        try:
+            Validation.handle_response(response)
+
+            length = response.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+            received = 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+                yield chunk
+        finally:
+            response.close()
+
+    def download_media(self, media_file_id, dest, chunk_size=65536, progress=None):
+        """Save content of a particular MEDIA FILE by its unique ID to a file, streaming it as it is received
+        without holding the whole file in memory
+
+        A file path is only created (or replaced) once the download is complete; until then the content is
+        written to the path with ".part" appended, which is removed if the download fails.
+
+        >>> api.download_media(1900, "/archive/2009785/report.pdf")
+        18392017
+
+        Arguments:
+            media_file_id -- ID that uniquely identifies a media file associated with an E-Link 2.0 Record
+            dest -- the file path to save to, or a binary file object to write to
+
+        Keyword Arguments:
+            chunk_size -- maximum bytes read and written at a time (default: 64 KiB)
+            progress -- function called after each chunk with the bytes received so far, and the total
+                        size if the server reports it (otherwise None) (default: None)
+
+        Returns:
+            int -- the number of bytes written
+        """
+        written = 0
+        with open_destination(dest) as file:
+            for chunk in self.iter_media_content(media_file_id, chunk_size=chunk_size, progress=progress):
+                file.write(chunk)
+                written += len(chunk)
+        return written
+
+    @_invalidates
+    def post_media(self, osti_id, file_path=None, title=None, stream=False, retry=False):
         """Attach the media found at the given filepath to the record associated
         with the given osti_id. 
 
@@ -465,6 +1100,8 @@ class Elink:
             file_path -- filesystem path to upload and  associate with this metadata
             title -- optional "title" for media file
             stream -- optional ability to stream the given file, ideal for larger files
+            retry -- retry transient failures per the retry policy, re-sending the file; POST is not
+                     idempotent, so only enable this where a duplicate media set is acceptable (default: False)
             
         Returns:
             MediaInfo 
@@ -483,10 +1120,12 @@ class Elink:
         if(len(parameters) > 0):
             query_params = "?" + urlencode(parameters)
         
+        # retry around the whole upload, so each attempt re-reads the file
         if(stream):
-            response = self.__post_media_stream(osti_id, file_path, query_params)
+            send = lambda: self.__post_media_stream(osti_id, file_path, query_params)
         else:
-            response = self.__post_media_no_stream(osti_id, file_path, query_params)
+            send = lambda: self.__post_media_no_stream(osti_id, file_path, query_params)
+        response = self.session.retrying("POST", send, retry=retry)
             
         Validation.handle_response(response)
 
@@ -512,24 +1151,26 @@ class Elink:
         # if posting a FILE, send that; if not, send just the PARAMETERS
         if file_path is not None:
             if(file_path.startswith("http")):
-                response = requests.get(file_path, stream=True)
+                response = self.session.get(file_path, stream=True)
                 response.raw.decode_content = True
                 
                 mp_encoder = MultipartEncoder(
                     fields={'file': (filename, response.content, mimetypes.guess_type(filename)[0])}
                 )
-                response = requests.post(f'{self.target}media/{osti_id}{query_params}',
+                response = self.session.post(f'{self.target}media/{osti_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}", "Content-Type": mp_encoder.content_type},
-                            data=mp_encoder)
+                            data=mp_encoder,
+                            retry=False)
             else:
                 with open(file_path, 'rb') as f:
                     m = MultipartEncoder(
                             fields={'file': (filename, f, mimetypes.guess_type(filename)[0] )}
                     )
 
-                    response = requests.post(f'{self.target}media/{osti_id}{query_params}',
+                    response = self.session.post(f'{self.target}media/{osti_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}", 'Content-Type': m.content_type },
-                            data=m)
+                            data=m,
+                            retry=False)
         else:
             raise ValueError("File path is missing.")
             
@@ -555,22 +1196,25 @@ class Elink:
         # if posting a FILE, send that; if not, send just the PARAMETERS
         if file_path is not None:
             if(file_path.startswith("http")):
-                res = requests.get(file_path)
+                res = self.session.get(file_path)
                 filename = os.path.basename(file_path) or str(osti_id) + ".pdf"
 
-                response = requests.post(f'{self.target}media/{osti_id}{query_params}',
+                response = self.session.post(f'{self.target}media/{osti_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}"},
-                            files={'file': (filename, res.content, mimetypes.guess_type(filename)[0])})
+                            files={'file': (filename, res.content, mimetypes.guess_type(filename)[0])},
+                            retry=False)
             else:
-                response = requests.post(f'{self.target}media/{osti_id}{query_params}',
+                response = self.session.post(f'{self.target}media/{osti_id}{query_params}',
                         headers = { "Authorization" : f"Bearer {self.token}"},
-                        files={ 'file': open(file_path, 'rb') })
+                        files={ 'file': open(file_path, 'rb') },
+                        retry=False)
         else:
             raise ValueError("File path is missing.")
             
         return response
 
-    def put_media(self, osti_id, media_id, file_path=None, title=None, stream=False):
+    @_invalidates
+    def put_media(self, osti_id, media_id, file_path=None, title=None, stream=False, retry=None):
         """Replace a given media set with a new basis file.
         This will replace the previous media set. Both osti_id and media_id (of the set to replace) 
         are required.
@@ -583,6 +1227,7 @@ class Elink:
             title -- optional "title" for media file
             file_path -- filesystem path to upload and  associate with this metadata
             stream -- optional ability to stream the given file, ideal for larger files
+            retry -- True/False to override whether transient failures are retried (default: per retry policy)
             
         Returns:
             MediaInfo 
@@ -601,10 +1246,12 @@ class Elink:
         if(len(parameters) > 0):
             query_params = "?" + urlencode(parameters)
         
+        # retry around the whole upload, so each attempt re-reads the file
         if(stream):
-            response = self.__put_media_stream(osti_id, media_id, file_path, query_params)
+            send = lambda: self.__put_media_stream(osti_id, media_id, file_path, query_params)
         else:
-            response = self.__put_media_no_stream(osti_id, media_id, file_path, query_params)
+            send = lambda: self.__put_media_no_stream(osti_id, media_id, file_path, query_params)
+        response = self.session.retrying("PUT", send, retry=retry)
             
         Validation.handle_response(response)
 
@@ -632,15 +1279,16 @@ class Elink:
         # if posting a FILE, send that; if not, send just the PARAMETERS
         if file_path is not None:
             if(file_path.startswith("http")):
-                response = requests.get(file_path, stream=True)
+                response = self.session.get(file_path, stream=True)
                 response.raw.decode_content = True
                 
                 mp_encoder = MultipartEncoder(
                     fields={'file': (filename, response.content, mimetypes.guess_type(filename)[0])}
                 )   
-                response = requests.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
+                response = self.session.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}", "Content-Type": mp_encoder.content_type},
-                            data=mp_encoder)
+                            data=mp_encoder,
+                            retry=False)
                 
             else:
                 with open(file_path, 'rb') as f:
@@ -648,9 +1296,10 @@ class Elink:
                             fields={'file': (filename, f, mimetypes.guess_type(filename)[0] )}
                     )
 
-                    response = requests.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
+                    response = self.session.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}", 'Content-Type': m.content_type },
-                            data=m)
+                            data=m,
+                            retry=False)
         else:
             raise ValueError("File path is missing.")
             
@@ -675,21 +1324,24 @@ class Elink:
         # if putting a FILE, send that; if not, send just the PARAMETERS
         if file_path is not None:
             if(file_path.startswith("http")):
-                res = requests.get(file_path)
+                res = self.session.get(file_path)
                 filename = os.path.basename(file_path) or str(osti_id) + ".pdf"
 
-                response = requests.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
+                response = self.session.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
                             headers = { "Authorization" : f"Bearer {self.token}"},
-                            files={'file': (filename, res.content, mimetypes.guess_type(filename)[0]) })
+                            files={'file': (filename, res.content, mimetypes.guess_type(filename)[0]) },
+                            retry=False)
             else:
-                response = requests.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
+                response = self.session.put(f'{self.target}media/{osti_id}/{media_id}{query_params}',
                         headers = { "Authorization" : f"Bearer {self.token}"},
-                        files={ 'file': open(file_path, 'rb') })
+                        files={ 'file': open(file_path, 'rb') },
+                        retry=False)
         else:
             raise ValueError("File path is missing.")
             
         return response
     
+    @_invalidates
     def delete_record(self, osti_id:int, reason:str) -> None:
         """"
         Delete a given metadata record from the system by its OSTI ID
@@ -706,12 +1358,13 @@ class Elink:
             ServerException -- unknown service error occurred
         """
 
-        response = requests.delete(f"{self.target}records/{osti_id}?reason={reason}",
-                                   headers = { "Authorization" : f"Bearer {self.token}"})
+        response = self.session.delete(f"{self.target}records/{osti_id}?reason={reason}",
+                                       headers = { "Authorization" : f"Bearer {self.token}"})
         
         Validation.handle_response(response)
 
 
+    @_invalidates
     def delete_single_media(self, osti_id, media_id, reason):
         """Disassociate an individual media set from this OSTI ID
 
@@ -723,13 +1376,14 @@ class Elink:
         Returns:
             int - the total number of rows removed
         """
-        response = requests.delete(f"{self.target}media/{osti_id}/{media_id}?reason={reason}", headers={"Authorization": f"Bearer {self.token}"})
+        response = self.session.delete(f"{self.target}media/{osti_id}/{media_id}?reason={reason}", headers={"Authorization": f"Bearer {self.token}"})
 
         Validation.handle_response(response)
 
         if(response.status_code == 204): 
             return int(response.headers['x-total-count'])
 
+    @_invalidates
     def delete_all_media(self, osti_id, reason):
         """Disassociate ALL media sets from this OSTI ID 
         
@@ -740,7 +1394,7 @@ class Elink:
         Returns:
             int - the total number of rows removed
         """
-        response = requests.delete(f"{self.target}media/{osti_id}?reason={reason}", headers={"Authorization": f"Bearer {self.token}"})
+        response = self.session.delete(f"{self.target}media/{osti_id}?reason={reason}", headers={"Authorization": f"Bearer {self.token}"})
 
         Validation.handle_response(response)
         
@@ -57,6 +57,8 @@ class APIException(Exception):
         Attempt to parse the text string for JSON response; if unable,
         take the message verbatim.
         """
+        # each exception has its own error details
+        self.errors = []
         # default a message from the status code if present
         if text is None and self.status_code:
             self.message = HTTP_STATUS_CODES.get(status_code, "")
@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List
 
 class Geolocation(BaseModel):
@@ -32,7 +33,9 @@ class Geolocation(BaseModel):
 
         @field_validator("latitude")
         @classmethod
-        def validate_latitude(cls, lat) -> float:
+        def validate_latitude(cls, lat, info: ValidationInfo) -> float:
+            if Validation.trusted(info):
+                return lat
             if not isinstance(lat, (int, float)):
                 raise ValueError("Latitude value is not numeric.")
             
@@ -42,7 +45,9 @@ class Geolocation(BaseModel):
         
         @field_validator("longitude")
         @classmethod
-        def validate_longitude(cls, value) -> float:
+        def validate_longitude(cls, value, info: ValidationInfo) -> float:
+            if Validation.trusted(info):
+                return value
             if not isinstance(value, (int, float)):
                 raise ValueError('Longitude is not numeric.')
             
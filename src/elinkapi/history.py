@@ -0,0 +1,101 @@
+import bisect
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from .exceptions import APIException
+
+def _utc(value) -> datetime:
+    """ a datetime, date or ISO string as an aware datetime; naive values (and dates, at midnight) are taken as UTC."""
+    if isinstance(value, str):
+        # fromisoformat accepts a trailing Z only from Python 3.11
+        value = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+class RevisionTimeline:
+    """
+    The revisions of a record (from Elink.get_all_revisions) ordered by the time each became
+    valid, answering which revision was in effect at a given time by binary search, without
+    a request to the API.
+
+    >>> timeline = RevisionTimeline(api.get_all_revisions(2009785))
+    >>> timeline.at(datetime(2024, 3, 1, tzinfo=timezone.utc)).revision
+    2
+
+    Arguments:
+        revisions -- the Revision entries of one record
+    """
+    def __init__(self, revisions):
+        self.revisions = sorted(revisions, key=lambda revision: _utc(revision.date_valid_start))
+        self._starts = [_utc(revision.date_valid_start) for revision in self.revisions]
+
+    def at(self, when):
+        """
+        The revision valid at the given time: the last to start at or before it, unless that
+        revision had ended by then.
+
+        Arguments:
+            when -- a datetime, date or ISO date-time string; naive values (and dates, at midnight) are UTC
+
+        Returns:
+            Revision, or None if the record had no revision in effect at that time
+        """
+        when = _utc(when)
+        position = bisect.bisect_right(self._starts, when)
+        if position == 0:
+            return None
+
+        revision = self.revisions[position - 1]
+        if revision.date_valid_end is not None and _utc(revision.date_valid_end) <= when:
+            return None
+        return revision
+
+    def __len__(self) -> int:
+        return len(self.revisions)
+
+def harvest_revisions(api, records, workers, cache=True, on_error=None):
+    """
+    Yield (osti_id, Revision, RecordResponse) for every revision of each of the given records,
+    fetching revision histories and revision metadata concurrently.  See Elink.harvest_revisions.
+    """
+    limit = max(1, workers) * 2
+    osti_ids = (int(getattr(record, "osti_id", record)) for record in records)
+    # revisions whose histories are read, waiting for their metadata to be requested
+    waiting = deque()
+    pending = {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        while True:
+            # finish the records already started before starting others
+            while len(pending) < limit:
+                if waiting:
+                    osti_id, revision = waiting.popleft()
+                    future = executor.submit(api.get_revision_by_number, osti_id, revision.revision, cache=cache)
+                    pending[future] = (osti_id, revision)
+                else:
+                    osti_id = next(osti_ids, None)
+                    if osti_id is None:
+                        break
+                    pending[executor.submit(api.get_all_revisions, osti_id, cache=cache)] = (osti_id, None)
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                osti_id, revision = pending.pop(future)
+                try:
+                    value = future.result()
+                except APIException as error:
+                    if on_error is None:
+                        raise
+                    on_error(osti_id, revision, error)
+                    continue
+
+                if revision is None:
+                    waiting.extend((osti_id, entry) for entry in sorted(value, key=lambda entry: entry.revision))
+                else:
+                    yield osti_id, revision, value
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 
 class Identifier(BaseModel):
     """
@@ -48,7 +49,9 @@ class Identifier(BaseModel):
     
     @field_validator("type")
     @classmethod
-    def type_must_be_valid(cls, value: str) -> str:
-        if value not in [type.value for type in Identifier.Type]:
+    def type_must_be_valid(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(Identifier.Type):
             raise ValueError("Unknown type value {}.".format(value))
         return value
\ No newline at end of file
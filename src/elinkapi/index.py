@@ -0,0 +1,179 @@
+import bisect
+import re
+import threading
+from collections import defaultdict
+
+_WORD = re.compile(r"\w+")
+
+def _words(text) -> set:
+    return set(_WORD.findall(text.lower())) if text else set()
+
+class RecordIndex:
+    """
+    In-memory index over a set of records, answering searches locally without calls to
+    the API.  Supports full-text search of title, description and keywords (all words
+    must match, in any of those fields, ignoring case), exact matches on product_type,
+    workflow_status and site_ownership_code, and publication_date ranges.
+
+    Records may be loaded from any iterable of records, such as a Query, a ParallelScan
+    or a SQLiteRecordStore, and added, replaced or removed individually afterwards.
+
+    .. code-block:: python
+        index = RecordIndex(api.query_records(site_ownership_code='LLNL', workers=8))
+
+        reports = index.search("neutron transport", product_type="TR",
+                               publication_date_from=date(2020, 1, 1))
+        released = index.count(workflow_status="R", product_type=["TR", "JA"])
+
+    Keyword filter values may be a single value, or a list of values any of which may match.
+    """
+    FIELDS = ("product_type", "workflow_status", "site_ownership_code")
+
+    def __init__(self, records=None):
+        self._lock = threading.Lock()
+        self._records = {}
+        self._words = defaultdict(set)
+        self._fields = { field: defaultdict(set) for field in self.FIELDS }
+        # (publication_date, osti_id) in order, for range searches
+        self._dates = []
+
+        if records is not None:
+            self.update(records)
+
+    def _text(self, record) -> set:
+        return _words(record.title) | _words(record.description) | \
+               set().union(*[_words(keyword) for keyword in record.keywords or []])
+
+    def _remove(self, osti_id):
+        record = self._records.pop(osti_id, None)
+        if record is None:
+            return
+
+        for word in self._text(record):
+            postings = self._words[word]
+            postings.discard(osti_id)
+            if not postings:
+                del self._words[word]
+        for field in self.FIELDS:
+            postings = self._fields[field][getattr(record, field)]
+            postings.discard(osti_id)
+            if not postings:
+                del self._fields[field][getattr(record, field)]
+        if record.publication_date is not None:
+            entry = (record.publication_date, osti_id)
+            position = bisect.bisect_left(self._dates, entry)
+            if position < len(self._dates) and self._dates[position] == entry:
+                del self._dates[position]
+
+    def _add(self, record, dates):
+        osti_id = record.osti_id
+        self._remove(osti_id)
+        self._records[osti_id] = record
+
+        for word in self._text(record):
+            self._words[word].add(osti_id)
+        for field in self.FIELDS:
+            self._fields[field][getattr(record, field)].add(osti_id)
+        if record.publication_date is not None:
+            dates.append((record.publication_date, osti_id))
+
+    def add(self, record):
+        """ Add a record to the index, replacing any record with the same OSTI ID. """
+        with self._lock:
+            dates = []
+            self._add(record, dates)
+            for entry in dates:
+                bisect.insort(self._dates, entry)
+
+    def update(self, records):
+        """ Add many records to the index, replacing any with the same OSTI IDs. """
+        # the dates of a batch are only merged at its end, so each OSTI ID may be added once;
+        # a later record replaces an earlier one with the same OSTI ID
+        records = { record.osti_id: record for record in records }
+        with self._lock:
+            dates = []
+            for record in records.values():
+                self._add(record, dates)
+            self._dates.extend(dates)
+            self._dates.sort()
+
+    def remove(self, osti_id):
+        """ Remove the record with the given OSTI ID from the index, if present. """
+        with self._lock:
+            self._remove(int(osti_id))
+
+    def get(self, osti_id):
+        """ The indexed record with the given OSTI ID, or None. """
+        return self._records.get(int(osti_id))
+
+    def _match(self, text, publication_date_from, publication_date_to, filters) -> set:
+        """ OSTI IDs of the records satisfying every given condition."""
+        candidates = []
+
+        for word in _words(text):
+            candidates.append(self._words.get(word, set()))
+
+        for field, value in filters.items():
+            if value is None:
+                continue
+            index = self._fields[field]
+            if isinstance(value, (list, tuple, set, frozenset)):
+                candidates.append(set().union(*[index.get(item, set()) for item in value]))
+            else:
+                candidates.append(index.get(value, set()))
+
+        if publication_date_from is not None or publication_date_to is not None:
+            low = bisect.bisect_left(self._dates, (publication_date_from,)) if publication_date_from else 0
+            high = bisect.bisect_left(self._dates, (publication_date_to, float("inf"))) if publication_date_to else len(self._dates)
+            candidates.append({ osti_id for _, osti_id in self._dates[low:high] })
+
+        if not candidates:
+            return set(self._records)
+
+        # intersect starting from the most selective condition
+        candidates.sort(key=len)
+        matched = candidates[0]
+        for other in candidates[1:]:
+            if not matched:
+                break
+            matched = matched & other
+        return matched
+
+    def search(self, text=None, product_type=None, workflow_status=None, site_ownership_code=None,
+               publication_date_from=None, publication_date_to=None, limit=None) -> list:
+        """
+        Find the indexed records satisfying all of the given conditions.
+
+        Keyword Arguments:
+            text -- words to find in the title, description or keywords; all must be present
+            product_type -- product type value(s) to match
+            workflow_status -- workflow status value(s) to match
+            site_ownership_code -- site code(s) to match
+            publication_date_from -- earliest publication date (a date), inclusive
+            publication_date_to -- latest publication date (a date), inclusive
+            limit -- maximum number of records to return (default: None, all)
+
+        Returns:
+            list of matching records, in OSTI ID order
+        """
+        with self._lock:
+            matched = self._match(text, publication_date_from, publication_date_to,
+                                  { "product_type": product_type,
+                                    "workflow_status": workflow_status,
+                                    "site_ownership_code": site_ownership_code })
+            return [self._records[osti_id] for osti_id in sorted(matched)[:limit]]
+
+    def count(self, text=None, product_type=None, workflow_status=None, site_ownership_code=None,
+              publication_date_from=None, publication_date_to=None) -> int:
+        """ The number of indexed records satisfying all of the given conditions; see search. """
+        with self._lock:
+            return len(self._match(text, publication_date_from, publication_date_to,
+                                   { "product_type": product_type,
+                                     "workflow_status": workflow_status,
+                                     "site_ownership_code": site_ownership_code }))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, osti_id) -> bool:
+        return int(osti_id) in self._records
@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import threading
+
+class SQLiteKeyStore:
+    """
+    Local map from site keys (site_ownership_code and site_unique_id) to the OSTI IDs of
+    the records created for them, kept in a SQLite database file.  Elink consults it in
+    post_new_record(idempotent=True) before asking the server, and records each key once
+    its record is created, so that repeated submissions of a record are recognized
+    without a request.
+
+    Keys are kept per API target, so review and production records are not confused.
+
+    >>> api = Elink(token=MYUSERTOKEN, key_store=SQLiteKeyStore("/var/lib/elink/site-keys.db"))
+    >>> api.post_new_record(record, idempotent=True)    # created, and its key recorded
+    >>> api.post_new_record(record, idempotent=True)    # found; not created again
+
+    Arguments:
+        path -- the database file; created if not present
+
+    Keyword Arguments:
+        timeout -- seconds to wait for another process holding the database lock (default: 30)
+    """
+    def __init__(self, path, timeout=30.0):
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self._connection().execute("CREATE TABLE IF NOT EXISTS keys (target TEXT, site_ownership_code TEXT, "
+                                   "site_unique_id TEXT, osti_id INTEGER, "
+                                   "PRIMARY KEY (target, site_ownership_code, site_unique_id))")
+
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def get(self, target, site_ownership_code, site_unique_id) -> int:
+        """ The OSTI ID recorded for the key, or None. """
+        row = self._connection().execute("SELECT osti_id FROM keys WHERE target = ? AND site_ownership_code = ? "
+                                         "AND site_unique_id = ?",
+                                         (target, site_ownership_code, site_unique_id)).fetchone()
+        return row[0] if row else None
+
+    def put(self, target, site_ownership_code, site_unique_id, osti_id):
+        """ Record the OSTI ID of the record created for the key. """
+        self._connection().execute("INSERT OR REPLACE INTO keys (target, site_ownership_code, site_unique_id, osti_id) "
+                                   "VALUES (?, ?, ?, ?)",
+                                   (target, site_ownership_code, site_unique_id, int(osti_id)))
+
+    def discard(self, target, site_ownership_code, site_unique_id):
+        """ Forget the key, such as when its record has been deleted. """
+        self._connection().execute("DELETE FROM keys WHERE target = ? AND site_ownership_code = ? AND site_unique_id = ?",
+                                   (target, site_ownership_code, site_unique_id))
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM keys").fetchone()[0]
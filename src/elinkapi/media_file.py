@@ -1,4 +1,5 @@
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List
 from enum import Enum
 import datetime
@@ -51,7 +52,9 @@ class MediaFile(BaseModel):
 
     @field_validator("url_type")
     @classmethod
-    def url_type_must_be_valid(cls, value: str) -> str:
-        if value not in [type.value for type in cls.UrlType]:
+    def url_type_must_be_valid(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(cls.UrlType):
             raise ValueError("Unknown URL type {}.".format(value))
         return value
\ No newline at end of file
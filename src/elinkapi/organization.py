@@ -1,6 +1,6 @@
 from enum import Enum
 from .identifier import Identifier
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator, ValidationInfo
 from typing import List, Optional
 from .utils import Validation
 from .contribution import Contribution
@@ -41,15 +41,19 @@ class Organization(BaseModel):
 
     @field_validator("type")
     @classmethod
-    def type_must_be_valid(cls, value: str) -> str:
-        if value not in [type.value for type in cls.Type]:
+    def type_must_be_valid(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(cls.Type):
             raise ValueError("Unknown type value {}.".format(value))
         return value
     
     @field_validator("contributor_type")
     @classmethod
-    def contributor_must_be_valid(cls, value: str) -> str:
-        if value not in [type.value for type in Contribution]:
+    def contributor_must_be_valid(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(Contribution):
             raise ValueError("Unknown contribution type {}.".format(value))
         return value
 
@@ -59,7 +63,9 @@ class Organization(BaseModel):
     
     @field_validator("ror_id")
     @classmethod
-    def validate_ror_id(cls, value: str) -> str:
+    def validate_ror_id(cls, value: str, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
         if value is not None:
             Validation.find_ror_value(value)
         return value
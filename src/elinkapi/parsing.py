@@ -0,0 +1,53 @@
+from pydantic import TypeAdapter
+from typing import List
+from .record import RecordResponse
+from .media_info import MediaInfo
+from .revision import Revision
+from .revision_comparison import RevisionComparison
+
+# validation context marking data as already validated by the server
+TRUSTED = { "trusted": True }
+
+class ModelParser:
+    """
+    Validates API response bodies directly from JSON bytes into model instances, using
+    pydantic adapters built once per model.  The bytes are parsed and validated in a
+    single pass, without first being decoded into Python dicts.
+
+    If trusted, the custom field validators of the models accept server values without
+    checking them (see Validation.trusted); types are still enforced.
+
+    >>> records = PARSERS[RecordResponse].parse(response.content, trusted=True)
+    """
+    def __init__(self, model):
+        self.model = model
+        self._single = TypeAdapter(model)
+        self._array = TypeAdapter(List[model])
+
+    def parse(self, content, trusted=False) -> list:
+        """
+        Validate a JSON body holding a single object or an array of them.
+
+        Arguments:
+            content -- the JSON document, as bytes or str
+
+        Keyword Arguments:
+            trusted -- skip custom field validation checks (default: False)
+
+        Returns:
+            list of model instances
+        """
+        context = TRUSTED if trusted else None
+        # the API returns either a single object or an array; look at the first character
+        start = content[:64].lstrip()[:1]
+        if start in (b"[", "["):
+            return self._array.validate_json(content, context=context)
+        return [self._single.validate_json(content, context=context)]
+
+    def parse_object(self, data, trusted=False):
+        """
+        Validate a single already-decoded object (dict) into a model instance.
+        """
+        return self._single.validate_python(data, context=TRUSTED if trusted else None)
+
+PARSERS = { model: ModelParser(model) for model in [RecordResponse, MediaInfo, Revision, RevisionComparison] }
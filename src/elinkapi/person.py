@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List, Optional
 from .affiliation import Affiliation
 from .contribution import Contribution
@@ -41,15 +42,19 @@ class Person(BaseModel):
 
     @field_validator("type")
     @classmethod
-    def type_must_be_valid(cls, value) -> str:
-        if value not in [type.value for type in cls.Type]:
+    def type_must_be_valid(cls, value, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(cls.Type):
             raise ValueError('Unknown type value {}.'.format(value))
         return value
 
     @field_validator("contributor_type")
     @classmethod
-    def contributor_must_be_valid(cls, value) -> str:
-        if value and value not in [type.value for type in Contribution]:
+    def contributor_must_be_valid(cls, value, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value and value not in Validation.enum_values(Contribution):
             raise ValueError('Unknown contributor type value {}.'.format(value))
         return value
     
@@ -0,0 +1,169 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from .bulk import run_bulk
+
+class ChangeJournal:
+    """
+    Record of the rows of change files already applied by Elink.apply_changes, kept in a
+    SQLite database file.  Each row's outcome is written as soon as it completes, so a run
+    that is interrupted or crashes resumes by sending only the rows not yet applied.
+
+    Rows are identified by their number within the file, and files by their absolute path
+    (or a given name), so one journal may serve several change files.
+
+    >>> journal = ChangeJournal("/var/lib/elink/changes.journal.db")
+    >>> for result in api.apply_changes("changes.ndjson", journal=journal):
+    ...     pass
+    >>> journal.failures(os.path.abspath("changes.ndjson"))
+    [(17, 'title required')]
+
+    Arguments:
+        path -- the database file; created if not present
+
+    Keyword Arguments:
+        timeout -- seconds to wait for another process holding the database lock (default: 30)
+    """
+    def __init__(self, path, timeout=30.0):
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self._connection().execute("CREATE TABLE IF NOT EXISTS rows (source TEXT, row INTEGER, osti_id INTEGER, "
+                                   "revision INTEGER, error TEXT, PRIMARY KEY (source, row))")
+
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def applied(self, source, row, failed=True) -> bool:
+        """ Whether the row of source has been recorded; rows that failed count only if failed. """
+        found = self._connection().execute("SELECT error FROM rows WHERE source = ? AND row = ?",
+                                           (source, row)).fetchone()
+        return found is not None and (failed or found[0] is None)
+
+    def record(self, source, result):
+        """ Record the outcome (a BulkResult) of a row of source. """
+        if result.ok:
+            values = (result.record.osti_id, result.record.revision, None)
+        else:
+            values = (None, None, getattr(result.error, "message", None) or str(result.error))
+        self._connection().execute("INSERT OR REPLACE INTO rows (source, row, osti_id, revision, error) VALUES (?, ?, ?, ?, ?)",
+                                   (source, result.index) + values)
+
+    def failures(self, source) -> list:
+        """ The (row, error message) of each row of source that failed, in row order. """
+        return self._connection().execute("SELECT row, error FROM rows WHERE source = ? AND error IS NOT NULL ORDER BY row",
+                                          (source,)).fetchall()
+
+    def clear(self, source=None):
+        """ Forget the rows recorded for source, or for every source. """
+        if source is None:
+            self._connection().execute("DELETE FROM rows")
+        else:
+            self._connection().execute("DELETE FROM rows WHERE source = ?", (source,))
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+def read_changes(changes, format):
+    """
+    Yield (row number, row) for each change in a file, reading one row at a time: the line's
+    text for NDJSON, a dict of column values for CSV.  Rows are numbered from 1; blank NDJSON
+    lines are skipped but counted.
+    """
+    if isinstance(changes, (str, os.PathLike)):
+        with open(changes, newline="", encoding="utf-8") as file:
+            yield from read_changes(file, format)
+        return
+
+    if format == "csv":
+        yield from enumerate(csv.DictReader(changes), start=1)
+    else:
+        for number, line in enumerate(changes, start=1):
+            if line.strip():
+                yield number, line
+
+def apply_change(api, row, state):
+    """
+    Apply one change row, sending it by the method its content calls for:
+
+    - a "patch" that is a list of JSON-patch operations: patch_json
+    - a "patch" that is an object of values: patch_record
+    - an NDJSON object without "patch": update_record, replacing the record with it
+    - a CSV row without a "patch" column: patch_record, with the row's non-empty columns
+
+    Every change names its record by "osti_id".
+
+    Returns:
+        RecordResponse -- the record as changed
+    """
+    if isinstance(row, str):
+        change = json.loads(row)
+        if not isinstance(change, dict):
+            raise ValueError("Change is not a JSON object.")
+    else:
+        # CSV: empty columns are not changes, and a patch column holds JSON
+        change = { key: value for key, value in row.items() if key is not None and value not in (None, "") }
+        if "patch" in change:
+            change["patch"] = json.loads(change["patch"])
+        else:
+            change = { "osti_id": change.pop("osti_id", None), "patch": change }
+
+    osti_id = change.pop("osti_id", None)
+    if osti_id in (None, ""):
+        raise ValueError("Change has no osti_id.")
+    osti_id = int(osti_id)
+
+    if "patch" not in change:
+        return api.update_record(osti_id, change, state=state)
+    if len(change) > 1:
+        raise ValueError("Change has both a patch and record fields.")
+
+    patch = change["patch"]
+    if not patch:
+        raise ValueError("Change patch is empty.")
+    if isinstance(patch, list):
+        return api.patch_json(osti_id, patch, state=state)
+    if isinstance(patch, dict):
+        return api.patch_record(osti_id, patch, state=state)
+    raise ValueError("Change patch is neither a list of operations nor an object.")
+
+def apply_changes(api, changes, journal=None, name=None, format=None, workers=4, state="save",
+                  ordered=False, in_flight=None, retry_failed=False):
+    """
+    Apply the changes in an NDJSON or CSV file concurrently, skipping rows the journal shows
+    as already applied.  See Elink.apply_changes.
+
+    Returns:
+        iterator of BulkResult -- for each row applied, its row number, the row, and either the
+        changed record or the error
+    """
+    if name is None and journal is not None:
+        if isinstance(changes, (str, os.PathLike)):
+            name = os.path.abspath(changes)
+        elif getattr(changes, "name", None):
+            name = os.path.abspath(changes.name)
+        else:
+            raise ValueError("A name is required to journal changes read from this file object.")
+
+    if format is None:
+        path = changes if isinstance(changes, (str, os.PathLike)) else getattr(changes, "name", "")
+        format = "csv" if os.fspath(path).lower().endswith(".csv") else "ndjson"
+    if format not in ("ndjson", "csv"):
+        raise ValueError(f"Unknown change file format {format}.")
+
+    rows = read_changes(changes, format)
+    if journal is not None:
+        rows = ((number, row) for number, row in rows
+                if not journal.applied(name, number, failed=not retry_failed))
+
+    return run_bulk(rows, lambda row: apply_change(api, row, state), workers,
+                    ordered=ordered, in_flight=in_flight, numbered=True,
+                    completed=None if journal is None else lambda result: journal.record(name, result))
@@ -1,8 +1,68 @@
 from .record import RecordResponse
-from .utils import Validation
-import json
+from .utils import Validation, iter_json_array
+from .parsing import PARSERS
+import queue
+import threading
+import weakref
 import requests
 
+class _PagePrefetcher:
+    """
+    Fetches and parses pages of a Query ahead of the consumer in a background thread,
+    following next_url links.  At most depth parsed pages are held waiting, plus the one
+    being fetched.
+
+    The thread keeps only a weak reference to its Query, and stops if the Query is
+    discarded, closed, or repositioned.
+    """
+    def __init__(self, query, next_url, depth):
+        self._pages = queue.Queue(maxsize=depth)
+        self._stopped = threading.Event()
+        weakref.finalize(query, self._stopped.set)
+        self._thread = threading.Thread(target=self._run, args=(weakref.ref(query), next_url), daemon=True)
+        self._thread.start()
+
+    def _run(self, query_ref, url):
+        while url and not self._stopped.is_set():
+            query = query_ref()
+            if query is None:
+                return
+            try:
+                page = query._read(query._fetch(url))
+            except Exception as error:
+                # hand the failure to the consumer when it reaches this page
+                page = error
+            del query
+
+            if not self._put(page) or isinstance(page, Exception):
+                return
+            url = page["next_url"]
+
+    def _put(self, page) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(self) -> dict:
+        """ Obtain the next page in order, waiting for it if necessary. """
+        page = self._pages.get()
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def stop(self):
+        """ Stop fetching and discard any buffered pages. """
+        self._stopped.set()
+        while True:
+            try:
+                self._pages.get_nowait()
+            except queue.Empty:
+                break
+
 class Query:
     """
     Search/query object.  Contains total count of records found,
@@ -18,6 +78,29 @@ class Query:
         
         for record in query:
             print (record.model_dump_json(exclude_none=True))
+
+    To work a page at a time, iter_pages() yields each page of results as a list.
+
+    .. code-block:: python
+        for page in query.iter_pages():
+            database.insert_many(page)
+
+    If created with a prefetch depth, the following pages (up to that many) are
+    requested and parsed in a background thread while the current one is consumed.
+
+    .. code-block:: python
+        with api.query_records(product_type = 'TR', prefetch=2) as query:
+            for record in query:
+                process(record)
+
+    If created with stream=True, each page's records are decoded and returned by iteration
+    as the response body arrives, rather than after the whole page has been read and
+    parsed.  Only the record being decoded is held in memory; "data" remains empty, and
+    iter_pages() collects each page as it is read.
+
+    .. code-block:: python
+        for record in api.query_records(product_type = 'TR', rows=1000, stream=True):
+            process(record)
     """
     total_rows: int
     next_url: str 
@@ -26,25 +109,71 @@ class Query:
     data: list[RecordResponse]
     _target: str
     _token: str
+    _session: requests.Session
+    _stream = False
+    _records = None
+    _trusted = False
+    # bytes read from a streamed response at a time
+    CHUNK_SIZE = 65536
     
     def _response_to_records(self, response):
         """Returns array of Records"""
-        json_records = json.loads(response.text)
-        
-        if(not isinstance(json_records, list)):
-            json_records = [json_records]
-        records = [RecordResponse(**record) for record in json_records]
-        
-        return records
+        return PARSERS[RecordResponse].parse(response.content, trusted=self._trusted)
+
+    def _stream_records(self, response):
+        """Yields Records as the response body arrives, closing it once read"""
+        try:
+            parser = PARSERS[RecordResponse]
+            for record in iter_json_array(response.iter_content(chunk_size=self.CHUNK_SIZE)):
+                yield parser.parse_object(record, trusted=self._trusted)
+        finally:
+            response.close()
     
+    def _read(self, response) -> dict:
+        """ read the page information and records from the response object."""
+        return {
+            "total_rows": int(response.headers['x-total-count'] if 'x-total-count' in response.headers else 0),
+            # strip servlet path from these for target link later
+            "first_url": response.links['first']['url'].replace("/elink2api/", "") if 'first' in response.links else "",
+            "next_url": response.links['next']['url'].replace('/elink2api/', '') if 'next' in response.links else '',
+            "previous_url": response.links['prev']['url'].replace('/elink2api/', '') if 'prev' in response.links else '',
+            "data": [] if self._stream else self._response_to_records(response),
+            "records": self._stream_records(response) if self._stream else None
+        }
+
+    def _apply(self, page):
+        """ make the given page read by _read the current one."""
+        self.total_rows = page["total_rows"]
+        self.first_url = page["first_url"]
+        self.next_url = page["next_url"]
+        self.previous_url = page["previous_url"]
+        self.data = page["data"]
+        # records of data already returned by iteration
+        self._position = 0
+        # when streaming, the records of the page still to be read
+        if self._records is not None:
+            self._records.close()
+        self._records = page["records"]
+
     def _load(self, response):
         """ load up information from the response object."""
-        self.total_rows = int(response.headers['x-total-count'] if 'x-total-count' in response.headers else 0)
-        # strip servlet path from these for target link later
-        self.first_url = response.links['first']['url'].replace("/elink2api/", "") if 'first' in response.links else ""
-        self.next_url = response.links['next']['url'].replace('/elink2api/', '') if 'next' in response.links else ''
-        self.previous_url = response.links['prev']['url'].replace('/elink2api/', '') if 'prev' in response.links else ''
-        self.data = self._response_to_records(response)
+        self._apply(self._read(response))
+
+    def _fetch(self, url):
+        """ request a page of results by its link."""
+        response = self._session.get(f"{self._target}{url}",
+                                     headers = { "Authorization" : f"Bearer {self._token}"},
+                                     stream = self._stream)
+        Validation.handle_response(response)
+        return response
+
+    def _start_prefetch(self):
+        """ begin fetching pages following the current one, if prefetching."""
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+        if self._prefetch > 0 and self.has_next():
+            self._prefetcher = _PagePrefetcher(self, self.next_url, self._prefetch)
 
     def total_count(self) -> int:
         return self.total_rows
@@ -52,13 +181,41 @@ class Query:
     def data(self):
         return self.data
 
-    def __init__(self, response, target=None, token=None):
+    def __init__(self, response, target=None, token=None, session=None, prefetch=0, stream=False, trusted=False):
         """
         Set up the object based on a given HTTP service response.
+
+        Subsequent pages are requested through the given session if provided, sharing
+        its pooled connections.  If prefetch is greater than zero, up to that many of
+        the following pages are fetched in the background ahead of iteration.  If stream
+        is True, records are decoded from each response (requested with stream=True) as
+        it arrives; streaming cannot be combined with prefetching.  If trusted, the records
+        skip their custom field checks (see Elink).
         """
+        if stream and prefetch > 0:
+            raise ValueError("Streamed queries cannot be prefetched.")
+        self._stream = stream
+        self._trusted = trusted
         self._load(response)
         self._target = target
         self._token = token
+        self._session = session or requests.Session()
+        self._prefetch = prefetch
+        self._prefetcher = None
+        self._start_prefetch()
+
+    def close(self):
+        """ Stop any background prefetching of pages, and release any response being streamed."""
+        self._prefetch = 0
+        self._start_prefetch()
+        if self._records is not None:
+            self._records.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def has_next(self):
         return self.next_url != ''
@@ -72,12 +229,36 @@ class Query:
     def next(self):
         return self.__next__()
     
+    def _next_page(self):
+        """ advance to the next page, already fetched if prefetching."""
+        if self._prefetcher is not None:
+            self._apply(self._prefetcher.get())
+        else:
+            self._load(self._fetch(self.next_url))
+
+    def iter_pages(self):
+        """
+        Yield the results a page at a time, as lists of records, following pages forward
+        until all rows are obtained.  The first page yielded holds any records of the current
+        page not yet returned by iteration.  Empty pages are skipped.
+        """
+        while True:
+            if self._records is not None:
+                page = list(self._records)
+            else:
+                page = self.data[self._position:] if self._position else self.data
+                self._position = len(self.data)
+            if page:
+                yield page
+
+            if not self.has_next():
+                return
+            self._next_page()
+
     def previous(self):
         if self.has_previous():
-            response = requests.get(f"{self._target}{self.previous_url}",
-                                    headers = { "Authorization" : f"Bearer {self._token}"})
-            Validation.handle_response(response)
-            self._load(response)
+            self._load(self._fetch(self.previous_url))
+            self._start_prefetch()
             return self
         else:
             raise StopIteration
@@ -88,10 +269,8 @@ class Query:
         raise StopIteration.
         """
         if self.first_url:
-            response = requests.get(f"{self._target}{self.first_url}",
-                                    headers = { "Authorization" : f"Bearer {self._token}"})
-            Validation.handle_response(response)
-            self._load(response)
+            self._load(self._fetch(self.first_url))
+            self._start_prefetch()
         else:
             raise StopIteration
 
@@ -101,18 +280,17 @@ class Query:
         Return the next record in this Query, if available.
         Once this runs out of pages with results, it will raise StopIteration.
         """
-        try:
-            record = self.data.pop(0)
-
-            return record
-        except IndexError:
-            # if we have a next page, try that
-            if self.has_next():
-                # get the next set
-                response = requests.get(f"{self._target}{self.next_url}",
-                                        headers = { "Authorization" : f"Bearer {self._token}"})
-                Validation.handle_response(response)
-                self._load(response)
-                return self.__next__()
-            else:
-                raise StopIteration
\ No newline at end of file
+        # move through pages until one has records remaining
+        while True:
+            if self._records is not None:
+                record = next(self._records, None)
+                if record is not None:
+                    return record
+            elif self._position < len(self.data):
+                record = self.data[self._position]
+                self._position += 1
+                return record
+
+            if not self.has_next():
+                raise StopIteration
+            self._next_page()
\ No newline at end of file
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+def _take(tokens, updated, now, rate, burst):
+    """
+    Token bucket arithmetic shared by the stores.  Refill the bucket for the time elapsed
+    since it was updated, then take one token.  The bucket may go into debt, in which case
+    the caller must wait for the returned number of seconds before proceeding; later callers
+    queue behind it.
+
+    Returns:
+        (remaining tokens, seconds to wait)
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate) - 1
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return tokens, wait
+
+class MemoryBucketStore:
+    """
+    Keeps token buckets in memory, shared by all threads using the same RateLimiter.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def take(self, name, rate, burst) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(name, (burst, now))
+            tokens, wait = _take(tokens, updated, now, rate, burst)
+            self._buckets[name] = (tokens, now)
+            return wait
+
+class SQLiteBucketStore:
+    """
+    Keeps token buckets in a local SQLite database file, so that several processes (or
+    several Elink instances) on the same machine draw on the same limits.
+
+    >>> limiter = RateLimiter(records=(5, 10), store=SQLiteBucketStore("/tmp/elink-limits.db"))
+
+    Arguments:
+        path -- the database file; created if not present
+
+    Keyword Arguments:
+        timeout -- seconds to wait for another process holding the database lock (default: 30)
+    """
+    def __init__(self, path, timeout=30.0):
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def take(self, name, rate, burst) -> float:
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front, serializing processes on this bucket
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+            tokens, updated = row if row else (burst, now)
+            tokens, wait = _take(tokens, updated, now, rate, burst)
+            connection.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                               (name, tokens, now))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return wait
+
+class RateLimiter:
+    """
+    Client-side token bucket rate limiter, pacing requests to the E-Link API so that one or
+    more clients sharing an account stay under the server's limits rather than bursting and
+    being throttled.
+
+    Requests are grouped into endpoint classes, each with its own limit:
+
+    records -- record metadata and query calls, and media information/removal calls
+    media -- media uploads (POST or PUT of media files)
+    revision -- revision history, revision lookup and revision comparison calls
+
+    Each limit is given as (rate, burst): a sustained number of requests per second, and
+    the number that may be made at once after a quiet period.  Endpoint classes with no
+    limit given are not paced.  Retried attempts also draw from the limits.
+
+    >>> limiter = RateLimiter(records=(10, 20), media=(1, 2), revision=(5, 5))
+    >>> api = Elink(token=MYUSERTOKEN, rate_limiter=limiter)
+
+    By default buckets are kept in memory and shared by all threads using the limiter.
+    Supply a SQLiteBucketStore to share them between processes on the same machine.
+
+    Keyword Arguments:
+        records -- (rate, burst) limit for record calls (default: None, unlimited)
+        media -- (rate, burst) limit for media uploads (default: None, unlimited)
+        revision -- (rate, burst) limit for revision calls (default: None, unlimited)
+        store -- bucket storage, MemoryBucketStore or SQLiteBucketStore (default: MemoryBucketStore())
+    """
+    RECORDS = "records"
+    MEDIA = "media"
+    REVISION = "revision"
+
+    def __init__(self, records=None, media=None, revision=None, store=None):
+        self.limits = { name: limit for name, limit in [(self.RECORDS, records),
+                                                         (self.MEDIA, media),
+                                                         (self.REVISION, revision)]
+                        if limit is not None }
+        self.store = store or MemoryBucketStore()
+
+    def classify(self, method, url):
+        """
+        Determine the endpoint class of a request from its method and URL, or None if it is
+        not an E-Link API call (for example, fetching a remote file to upload).
+        """
+        segments = [segment for segment in urlparse(url).path.split("/") if segment]
+
+        if "revision" in segments and "records" in segments:
+            return self.REVISION
+        elif "media" in segments:
+            return self.MEDIA if method.upper() in ("POST", "PUT") else self.RECORDS
+        elif "records" in segments:
+            return self.RECORDS
+        return None
+
+    def reserve(self, method, url) -> float:
+        """
+        Take a token for this request, returning the number of seconds the caller must
+        wait before sending it.
+        """
+        endpoint = self.classify(method, url)
+        if endpoint not in self.limits:
+            return 0.0
+
+        rate, burst = self.limits[endpoint]
+        return self.store.take(endpoint, rate, burst)
+
+    def acquire(self, method, url):
+        """ Wait until this request may be sent. """
+        wait = self.reserve(method, url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, method, url):
+        """ Asynchronously wait until this request may be sent. """
+        wait = self.reserve(method, url)
+        if wait > 0:
+            await asyncio.sleep(wait)
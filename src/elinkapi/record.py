@@ -6,7 +6,8 @@ from .related_identifier import RelatedIdentifier
 from .organization import Organization
 from .geolocation import Geolocation
 from .auditlogs import AuditLog
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List, Optional
 from datetime import datetime, date
 
@@ -238,10 +239,12 @@ class Record(BaseModel):
 
     @field_validator("access_limitations")
     @classmethod
-    def access_limitation_validation(cls, value)->List[str]:
+    def access_limitation_validation(cls, value, info: ValidationInfo)->List[str]:
+        if Validation.trusted(info):
+            return value
         bad_values=[]
         for v in value:
-            if v not in [limitation.name for limitation in AccessLimitation]:
+            if v not in AccessLimitation.__members__:
                 bad_values.append(v)
         if bad_values:
             raise ValueError('Unknown Access Limitation value(s): {}'.format(','.join(bad_values)))
@@ -249,10 +252,17 @@ class Record(BaseModel):
     
     @field_validator("publication_date", mode='before')
     @classmethod
-    def parse_date(cls, value) -> date:
+    def parse_date(cls, value, info: ValidationInfo) -> date:
         """
         Define several acceptable date-string formats to parse.
         """
+        if Validation.trusted(info) and isinstance(value, str):
+            # dates from the server are ISO formatted
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+
         format_strings=["%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"]
 
         # attempt each format to attempt parsing dates
@@ -268,8 +278,10 @@ class Record(BaseModel):
     
     @field_validator("product_type")
     @classmethod
-    def product_type_validation(cls, value) -> str:
-        if value not in [type.value for type in ProductType]:
+    def product_type_validation(cls, value, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(ProductType):
             raise ValueError('Unknown product type {}.'.format(value))
         return value
 
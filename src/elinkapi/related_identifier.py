@@ -1,5 +1,6 @@
 from enum import Enum
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List
 
 class RelatedIdentifier(BaseModel):
@@ -102,15 +103,19 @@ class RelatedIdentifier(BaseModel):
 
     @field_validator("type")
     @classmethod
-    def type_must_be_valid(cls, value) -> str:
-        if value not in [type.value for type in cls.Type]:
+    def type_must_be_valid(cls, value, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(cls.Type):
             raise ValueError('Unknown type value {}.'.format(value))
         return value
     
     @field_validator("relation")
     @classmethod
-    def relation_must_be_valid(cls, value) -> str:
-        if value not in [type.value for type in cls.Relation]:
+    def relation_must_be_valid(cls, value, info: ValidationInfo) -> str:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(cls.Relation):
             raise ValueError('Unknown relation type {}.'.format(value))
         return value
     
\ No newline at end of file
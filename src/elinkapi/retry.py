@@ -0,0 +1,236 @@
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+class RetryStats:
+    """
+    Running counters of retry activity for a RetryPolicy, useful for tuning it.
+
+    calls -- number of calls made through the policy (excluding those made with retry=False)
+    attempts -- total HTTP attempts, including retries
+    retries -- number of re-attempts made
+    recovered -- calls that succeeded after at least one retry
+    exhausted -- calls that still failed after retrying (attempts or deadline used up)
+    reasons -- count of retries by cause (HTTP status code or exception name)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.retries = 0
+            self.recovered = 0
+            self.exhausted = 0
+            self.reasons = Counter()
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _retried(self, reason):
+        with self._lock:
+            self.retries += 1
+            self.reasons[reason] += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return { "calls": self.calls,
+                     "attempts": self.attempts,
+                     "retries": self.retries,
+                     "recovered": self.recovered,
+                     "exhausted": self.exhausted,
+                     "reasons": dict(self.reasons) }
+
+    def __repr__(self) -> str:
+        return f"RetryStats({self.as_dict()})"
+
+class RetryPolicy:
+    """
+    Defines how failed E-Link API calls are retried.  A call is retried on connection
+    failures or timeouts, or on a response whose status is in retry_statuses, waiting an
+    exponentially increasing (and optionally jittered) delay between attempts.  A server
+    Retry-After header, if present, is used for the delay instead.
+
+    Only safe and idempotent HTTP methods (GET, PUT, DELETE, ...) are retried by default.
+    POST requests are retried only when the caller opts in for that call, for example
+    api.post_new_record(record, retry=True) for a record carrying a site_unique_id.
+
+    >>> api = Elink(token=MYUSERTOKEN, retry_policy=RetryPolicy(max_attempts=5, deadline=60))
+    >>> api.retry_policy.stats.as_dict()
+    {'calls': 12, 'attempts': 14, 'retries': 2, 'recovered': 2, 'exhausted': 0, 'reasons': {503: 2}}
+
+    Use RetryPolicy(max_attempts=1) to disable retries altogether.
+
+    Keyword Arguments:
+        max_attempts -- total attempts per call, including the first (default: 3)
+        backoff_factor -- base delay in seconds; attempt n waits backoff_factor * 2**(n-1) (default: 0.5)
+        backoff_max -- upper limit in seconds of any computed backoff delay (default: 30)
+        jitter -- if True, pick a random delay between 0 and the computed backoff ("full jitter") (default: True)
+        deadline -- seconds allowed for a call including all its retries, or None for no limit (default: None)
+        retry_statuses -- HTTP status codes to retry (default: 429, 500, 502, 503, 504)
+        methods -- HTTP methods retried without opting in (default: GET, HEAD, OPTIONS, PUT, DELETE)
+        respect_retry_after -- use the Retry-After response header when present (default: True)
+    """
+    RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    def __init__(self, max_attempts=3, backoff_factor=0.5, backoff_max=30.0, jitter=True, deadline=None,
+                 retry_statuses=None, methods=None, respect_retry_after=True):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses) if retry_statuses is not None else self.RETRY_STATUSES
+        self.methods = frozenset(m.upper() for m in methods) if methods is not None else self.IDEMPOTENT_METHODS
+        self.respect_retry_after = respect_retry_after
+        self.stats = RetryStats()
+
+    def allows(self, method, retry=None) -> bool:
+        """
+        Whether a call with this HTTP method may be retried.  An explicit retry value of
+        True or False for the call overrides the method default.
+        """
+        if retry is not None:
+            return retry
+        return method.upper() in self.methods
+
+    def backoff(self, attempt) -> float:
+        """ Delay in seconds to wait after the given (1-based) failed attempt. """
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_after(self, response):
+        """ Seconds requested by a Retry-After response header, or None if absent or unreadable. """
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def next_delay(self, method, attempt, started, retry=None, deadline=None, response=None, error=None):
+        """
+        Decide whether to make another attempt after a failed one, returning the delay in seconds to
+        wait first, or None if the call should not be retried.
+
+        Arguments:
+            method -- HTTP method of the call
+            attempt -- number of attempts made so far
+            started -- time.monotonic() value when the call began
+
+        Keyword Arguments:
+            retry -- per-call override of whether retrying is allowed (default: None, per method)
+            deadline -- per-call override of the policy deadline in seconds
+            response -- the response of the failed attempt, if one was received
+            error -- the exception raised by the failed attempt, if any
+
+        Returns:
+            float seconds to wait before retrying, or None
+        """
+        if error is None and (response is None or response.status_code not in self.retry_statuses):
+            return None
+
+        if not self.allows(method, retry) or attempt >= self.max_attempts:
+            if attempt > 1:
+                self.stats._add(exhausted=1)
+            return None
+
+        delay = self.retry_after(response) if self.respect_retry_after else None
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        deadline = self.deadline if deadline is None else deadline
+        if deadline is not None and time.monotonic() - started + delay > deadline:
+            self.stats._add(exhausted=1)
+            return None
+
+        self.stats._retried(type(error).__name__ if error is not None else response.status_code)
+        return delay
+
+    def call(self, method, send, retry=None, deadline=None, exceptions=(ConnectionError, TimeoutError)):
+        """
+        Perform send() according to this policy, retrying as needed.
+
+        Arguments:
+            method -- HTTP method of the call, used to determine if retrying is allowed
+            send -- callable making one attempt and returning its response
+
+        Keyword Arguments:
+            retry -- per-call override of whether retrying is allowed (default: None, per method)
+            deadline -- per-call override of the policy deadline in seconds
+            exceptions -- exception types considered transient connection failures
+
+        Returns:
+            the final response
+        """
+        if retry is False:
+            # explicitly not retryable; not counted in stats
+            return send()
+
+        started = time.monotonic()
+        attempt = 0
+        self.stats._add(calls=1)
+
+        while True:
+            attempt += 1
+            self.stats._add(attempts=1)
+            try:
+                response = send()
+            except exceptions as error:
+                delay = self.next_delay(method, attempt, started, retry=retry, deadline=deadline, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self.next_delay(method, attempt, started, retry=retry, deadline=deadline, response=response)
+                if delay is None:
+                    if attempt > 1 and response.status_code not in self.retry_statuses:
+                        self.stats._add(recovered=1)
+                    return response
+                response.close()
+
+            time.sleep(delay)
+
+    async def call_async(self, method, send, retry=None, deadline=None, exceptions=(ConnectionError, TimeoutError)):
+        """
+        Asynchronous form of call(); send() returns an awaitable of one attempt's response.
+        """
+        if retry is False:
+            return await send()
+
+        started = time.monotonic()
+        attempt = 0
+        self.stats._add(calls=1)
+
+        while True:
+            attempt += 1
+            self.stats._add(attempts=1)
+            try:
+                response = await send()
+            except exceptions as error:
+                delay = self.next_delay(method, attempt, started, retry=retry, deadline=deadline, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self.next_delay(method, attempt, started, retry=retry, deadline=deadline, response=response)
+                if delay is None:
+                    if attempt > 1 and response.status_code not in self.retry_statuses:
+                        self.stats._add(recovered=1)
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(delay)
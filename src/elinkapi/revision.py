@@ -1,4 +1,5 @@
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, ValidationInfo
+from .utils import Validation
 from typing import List
 from enum import Enum
 import datetime
@@ -15,10 +16,12 @@ class Revision(BaseModel):
 
     @field_validator("workflow_status")
     @classmethod
-    def workflow_status_must_be_valid(cls, value: str) -> str:
+    def workflow_status_must_be_valid(cls, value: str, info: ValidationInfo) -> str:
         """
         Require a valid value in workflow status.
         """
-        if value not in [type.value for type in WorkflowStatus]:
+        if Validation.trusted(info):
+            return value
+        if value not in Validation.enum_values(WorkflowStatus):
             raise ValueError("Unknown Workflow Status {}.".format(value))
         return value
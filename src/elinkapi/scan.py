@@ -0,0 +1,195 @@
+import math
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+
+_DONE = object()
+
+class ParallelScan:
+    """
+    Reads the results of a query concurrently, split into partitions fetched on a pool
+    of worker threads and merged back into a single iterator of records.  Produced by
+    query_records when workers are requested.
+
+    Partitions are either:
+
+    - page offsets (default): the pages of the query, as numbered by its paging links,
+      are fetched concurrently once the first page reveals the total row count.
+    - filters: a list of dicts of additional query parameters, each selecting a disjoint
+      subset of the results (for example, windows of date_metadata_updated).  Each such
+      partition is paged through serially, with partitions running concurrently.
+
+    Records are yielded in partition order if ordered is True, otherwise as soon as they
+    arrive.  Records are never yielded twice: any record seen in an earlier partition (for
+    example, shifted across a page boundary by a concurrent change) is skipped.  If the
+    total row count reported changes during a page-offset scan, the result set moved under
+    the scan, and a final serial pass yields any records missed.  For result sets that
+    change while they are being read, filter partitions on a stable key are preferable.
+
+    Memory is bounded: at most a few pages per worker are buffered ahead of the consumer.
+
+    .. code-block:: python
+        scan = api.query_records(site_ownership_code='LLNL', workers=8, ordered=False)
+        print (scan.total_rows)
+        for record in scan:
+            load(record)
+
+        windows = [ { "date_metadata_updated_from": f"{year}-01-01", "date_metadata_updated_to": f"{year}-12-31" }
+                    for year in range(2000, 2026) ]
+        for record in api.query_records(workers=8, partitions=windows):
+            load(record)
+    """
+    total_rows: int
+
+    def __init__(self, query, workers, ordered=True, partitions=None, api=None, parameters=None):
+        """
+        Set up the scan from the first page Query of the full result set.
+
+        Arguments:
+            query -- Query holding the first page of the (unpartitioned) results
+            workers -- number of partitions fetched at once
+
+        Keyword Arguments:
+            ordered -- yield records in partition order rather than as they arrive (default: True)
+            partitions -- list of dicts of filter parameters, one per partition (default: None, page offsets)
+            api -- the Elink connector, required for filter partitions
+            parameters -- the base query parameters, required for filter partitions
+        """
+        self._query = query
+        self._workers = max(1, workers)
+        self._ordered = ordered
+        self._partitions = partitions
+        self._api = api
+        self._parameters = parameters or {}
+        self.total_rows = query.total_rows
+
+    def _page_url(self, template, page):
+        """ the link to a given page number, following the form of the template link."""
+        parts = urlsplit(template)
+        parameters = [(name, str(page) if name == "page" else value) for name, value in parse_qsl(parts.query)]
+        return urlunsplit(parts._replace(query=urlencode(parameters)))
+
+    def _page_units(self):
+        """
+        Work units for a page-offset scan: the first page, already on hand, followed by one
+        unit per remaining page.  Returns None if the paging links do not number the pages.
+        """
+        query = self._query
+        first_page = query.data
+        next_page = dict(parse_qsl(urlsplit(query.next_url).query)).get("page") if query.has_next() else None
+
+        if not query.has_next():
+            return [lambda: iter([first_page])]
+        if next_page is None or not next_page.isdigit() or not first_page:
+            return None
+
+        first_number = int(next_page)
+        page_count = math.ceil(query.total_rows / len(first_page))
+        template = query.next_url
+
+        def unit(url):
+            def pages():
+                page = query._read(query._fetch(url))
+                if page["total_rows"] != self.total_rows:
+                    self._shifted = True
+                yield page["data"]
+            return pages
+
+        return [lambda: iter([first_page])] + [unit(self._page_url(template, first_number + n))
+                                               for n in range(page_count - 1)]
+
+    def _filter_units(self):
+        """ Work units for a filter-partitioned scan, each paging through its own query."""
+        def unit(partition):
+            def pages():
+                return self._api.query_records(**dict(self._parameters, **partition)).iter_pages()
+            return pages
+
+        return [unit(partition) for partition in self._partitions]
+
+    def _serial(self, restart=False):
+        """ Page serially through the result set, from its first page if restarting."""
+        if restart and self._query.first_url:
+            self._query.reset()
+        return self._query.iter_pages()
+
+    def _run(self, units):
+        """
+        Run the units on the worker pool, yielding their pages.  At most "workers" units are
+        started ahead of the consumer, each buffering at most two pages.
+        """
+        stopped = threading.Event()
+        shared = queue.Queue(maxsize=self._workers * 2)
+
+        def put(target, item):
+            while not stopped.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def work(index, pages, target):
+            try:
+                for page in pages():
+                    put(target, (index, page))
+            except Exception as error:
+                put(target, (index, error))
+            put(target, (index, _DONE))
+
+        executor = ThreadPoolExecutor(max_workers=self._workers)
+        units = iter(enumerate(units))
+        window = deque()
+
+        def start_next():
+            for index, pages in units:
+                target = queue.Queue(maxsize=2) if self._ordered else shared
+                executor.submit(work, index, pages, target)
+                window.append(target)
+                return True
+            return False
+
+        try:
+            for _ in range(self._workers):
+                start_next()
+
+            while window:
+                # ordered: read the oldest unit to completion; otherwise whatever arrives first
+                source = window[0] if self._ordered else shared
+                _, item = source.get()
+                if item is _DONE:
+                    window.popleft()
+                    start_next()
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self):
+        self._shifted = False
+        seen = set()
+
+        if self._partitions is not None:
+            units = self._filter_units()
+        else:
+            units = self._page_units()
+
+        pages = self._run(units) if units is not None else self._serial()
+
+        for page in pages:
+            for record in page:
+                if record.osti_id not in seen:
+                    seen.add(record.osti_id)
+                    yield record
+
+        if self._shifted:
+            for page in self._serial(restart=True):
+                for record in page:
+                    if record.osti_id not in seen:
+                        seen.add(record.osti_id)
+                        yield record
@@ -0,0 +1,61 @@
+import requests
+from requests.adapters import HTTPAdapter
+from .retry import RetryPolicy
+
+class ElinkSession(requests.Session):
+    """
+    HTTP session used by Elink and any Query it creates.  Holds a pool of keep-alive
+    connections so that repeated calls to the E-Link API reuse established TCP/TLS
+    connections rather than opening a new one per request.
+
+    Pool sizing follows the requests/urllib3 HTTPAdapter semantics:
+
+    pool_connections -- number of distinct hosts to keep connection pools for (default: 10)
+    pool_maxsize -- maximum number of connections kept open per host (default: 10)
+    pool_block -- if True, wait for a free connection once pool_maxsize connections are
+                  in use rather than opening (and discarding) extra ones (default: False)
+    keep_alive -- if False, ask the server to close each connection after its response (default: True)
+    retry_policy -- RetryPolicy applied to every request (default: RetryPolicy())
+    rate_limiter -- RateLimiter pacing every request attempt, or None for no pacing (default: None)
+
+    >>> session = ElinkSession(pool_maxsize=20, pool_block=True)
+    >>> api = Elink(token=MYUSERTOKEN, session=session)
+
+    Requests made through the session accept two additional keyword arguments, passed on to the
+    retry policy: retry (True/False to allow or forbid retrying this request regardless of its
+    HTTP method) and deadline (seconds allowed for this request including all retries).
+    """
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, retry_policy=None,
+                 rate_limiter=None):
+        super().__init__()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+
+    def request(self, method, url, *args, retry=None, deadline=None, **kwargs):
+        """
+        Send a request, retrying transient failures according to the retry policy.  Each
+        attempt first waits on the rate limiter, if any.
+        """
+        def send():
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(method, url)
+            return super(ElinkSession, self).request(method, url, *args, **kwargs)
+
+        return self.retrying(method, send, retry=retry, deadline=deadline)
+
+    def retrying(self, method, send, retry=None, deadline=None):
+        """
+        Call send(), which makes one HTTP attempt and returns its response, under the retry
+        policy.  Used where each attempt must rebuild its request body, such as file uploads.
+        """
+        return self.retry_policy.call(method, send, retry=retry, deadline=deadline,
+                                      exceptions=(requests.ConnectionError, requests.Timeout))
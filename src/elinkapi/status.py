@@ -0,0 +1,119 @@
+import itertools
+import time
+from .exceptions import NotFoundException, ForbiddenException
+from .record import WorkflowStatus
+
+RELEASED = (WorkflowStatus.Released,)
+FAILED = (WorkflowStatus.FailedValidation, WorkflowStatus.FailedRelease)
+
+class StatusReport:
+    """
+    The outcome of Elink.wait_for_status: each record watched, by OSTI ID, in one of
+
+    completed -- dict of records that reached a target status
+    failed -- dict of records that reached a failure status
+    timed_out -- dict of records still in another status when the time ran out (their last
+                 state seen, or None if never seen)
+    missing -- dict of OSTI IDs not on file or not accessible, to the NotFoundException or
+               ForbiddenException raised for them
+
+    polls -- number of polling cycles made
+
+    Records carry their audit_logs, explaining for instance a failed validation or release.
+
+    >>> report = api.wait_for_status(submitted, timeout=3600)
+    >>> for osti_id, record in report.failed.items():
+    ...     print(osti_id, record.workflow_status, [log.messages for log in report.audit_logs(osti_id)])
+    """
+    def __init__(self):
+        self.completed = {}
+        self.failed = {}
+        self.timed_out = {}
+        self.missing = {}
+        self.polls = 0
+
+    def audit_logs(self, osti_id) -> list:
+        """ The audit logs of a watched record, or an empty list if it has none (or was not seen). """
+        osti_id = int(osti_id)
+        for records in (self.completed, self.failed, self.timed_out):
+            if records.get(osti_id) is not None:
+                return records[osti_id].audit_logs or []
+        return []
+
+    def __repr__(self) -> str:
+        return (f"StatusReport(completed={len(self.completed)}, failed={len(self.failed)}, "
+                f"timed_out={len(self.timed_out)}, missing={len(self.missing)}, polls={self.polls})")
+
+def _values(statuses) -> set:
+    return { getattr(status, "value", status) for status in statuses }
+
+def wait_for_status(api, osti_ids, targets=RELEASED, failures=FAILED, timeout=None, interval=5.0,
+                    min_interval=1.0, max_interval=60.0, batch_size=100) -> StatusReport:
+    """
+    Poll the given records until each reaches a target or failure status, or the time runs
+    out.  See Elink.wait_for_status.
+    """
+    targets, failures = _values(targets), _values(failures)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    report = StatusReport()
+
+    waiting = { int(osti_id): None for osti_id in osti_ids }
+
+    def observe(record) -> bool:
+        """ file the record's current state in the report; whether its status has changed."""
+        previous = waiting[record.osti_id]
+        changed = previous is not None and previous.workflow_status != record.workflow_status
+
+        if record.workflow_status in targets:
+            report.completed[record.osti_id] = record
+        elif record.workflow_status in failures:
+            if record.audit_logs is None:
+                # the explanation is in the full record
+                record = api.get_single_record(record.osti_id, cache=False)
+            report.failed[record.osti_id] = record
+        else:
+            waiting[record.osti_id] = record
+            return changed
+        del waiting[record.osti_id]
+        return changed
+
+    while waiting:
+        report.polls += 1
+        changed = False
+        seen = set()
+
+        ids = iter(list(waiting))
+        for batch in iter(lambda: list(itertools.islice(ids, batch_size)), []):
+            # only the first page: anything else the server returns is not a watched record
+            for record in api.query_records(osti_id=batch, rows=len(batch)).data:
+                if record.osti_id not in waiting or record.osti_id in seen:
+                    continue
+                seen.add(record.osti_id)
+                changed = observe(record) or changed
+
+        # records the queries do not return may have been deleted or made inaccessible since
+        for osti_id in [osti_id for osti_id in waiting if osti_id not in seen]:
+            try:
+                record = api.get_single_record(osti_id, cache=False)
+            except (NotFoundException, ForbiddenException) as error:
+                report.missing[osti_id] = error
+                del waiting[osti_id]
+                continue
+            changed = observe(record) or changed
+
+        if not waiting:
+            break
+
+        # poll sooner while states are changing, and back off while they are not
+        if report.polls > 1:
+            interval = max(min_interval, interval / 2) if changed else min(max_interval, interval * 1.5)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+        else:
+            time.sleep(interval)
+
+    report.timed_out.update(waiting)
+    return report
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+from .record import RecordResponse
+from .parsing import PARSERS
+from .utils import dump_model
+
+class SQLiteRecordStore:
+    """
+    Local copy of E-Link records kept in a SQLite database file, maintained by
+    Elink.sync_records.  Each record is stored as its JSON, by OSTI ID, along with the
+    watermarks recording how far each synchronized query has been read.
+
+    >>> store = SQLiteRecordStore("/var/lib/elink/site-records.db")
+    >>> api.sync_records(store, site_ownership_code="LLNL")
+    >>> len(store)
+    48210
+    >>> store.get(2008590).title
+
+    Arguments:
+        path -- the database file; created if not present
+
+    Keyword Arguments:
+        timeout -- seconds to wait for another process holding the database lock (default: 30)
+    """
+    def __init__(self, path, timeout=30.0):
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS records (osti_id INTEGER PRIMARY KEY, date_metadata_updated TEXT, body TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, value TEXT)")
+
+    def _connection(self):
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def save(self, records, name=None, watermark=None):
+        """
+        Insert or replace the given records, and if named, set a watermark, in a single
+        transaction.
+
+        Arguments:
+            records -- iterable of RecordResponse
+
+        Keyword Arguments:
+            name -- the watermark to set
+            watermark -- its value, a JSON-serializable dict
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT OR REPLACE INTO records (osti_id, date_metadata_updated, body) VALUES (?, ?, ?)",
+                                   [(record.osti_id,
+                                     record.date_metadata_updated.isoformat() if record.date_metadata_updated else None,
+                                     dump_model(record).decode("utf-8"))
+                                    for record in records])
+            if name is not None:
+                connection.execute("INSERT OR REPLACE INTO watermarks (name, value) VALUES (?, ?)",
+                                   (name, json.dumps(watermark)))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def watermark(self, name) -> dict:
+        """ The watermark value last saved under name, or None. """
+        row = self._connection().execute("SELECT value FROM watermarks WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, osti_id) -> RecordResponse:
+        """ The stored record with the given OSTI ID, or None. """
+        row = self._connection().execute("SELECT body FROM records WHERE osti_id = ?", (int(osti_id),)).fetchone()
+        return PARSERS[RecordResponse].parse(row[0], trusted=True)[0] if row else None
+
+    def delete(self, osti_id):
+        """ Remove a record from the store. """
+        self._connection().execute("DELETE FROM records WHERE osti_id = ?", (int(osti_id),))
+
+    def __iter__(self):
+        """ Iterate over the stored records, in OSTI ID order. """
+        parser = PARSERS[RecordResponse]
+        for (body,) in self._connection().execute("SELECT body FROM records ORDER BY osti_id"):
+            yield parser.parse(body, trusted=True)[0]
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+# query parameters reading records in order of their last update
+ORDER = { "sort": "date_metadata_updated", "order": "asc" }
+
+def _utc(value) -> datetime:
+    """ a datetime (or ISO string) as an aware datetime, taking naive values as UTC."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+def sync_records(api, store, since=None, **filters) -> int:
+    """
+    Bring a record store up to date with the records matching the given query filters,
+    reading only those updated since the last synchronization.  See Elink.sync_records.
+
+    Records are read in order of date_metadata_updated, continuing each batch from the
+    latest update time stored so far rather than by page offset, so that records updated
+    while the synchronization runs are not skipped.  The watermark (that update time, and
+    the records stored at exactly that time) is saved with each batch, so an interrupted
+    run resumes where it stopped.
+
+    Returns:
+        int -- the number of records stored
+    """
+    # the watermark belongs to the filters, whatever the page size
+    name = urlencode(sorted((key, value) for key, value in filters.items() if key != "rows"))
+    if since is not None:
+        state = { "updated": _utc(since).isoformat(), "osti_ids": [] }
+    else:
+        state = store.watermark(name) or { "updated": None, "osti_ids": [] }
+
+    cursor = _utc(state["updated"])
+    at_cursor = set(state["osti_ids"])
+    stored = 0
+
+    while True:
+        parameters = dict(filters, **ORDER)
+        if cursor is not None:
+            parameters["date_metadata_updated_from"] = cursor.isoformat()
+        query = api.query_records(**parameters)
+
+        advanced = False
+        for page in query.iter_pages():
+            # skip records already stored as of the watermark
+            changed = [record for record in page
+                       if cursor is None or record.date_metadata_updated is None
+                       or _utc(record.date_metadata_updated) > cursor
+                       or (_utc(record.date_metadata_updated) == cursor and record.osti_id not in at_cursor)]
+            if not changed:
+                continue
+
+            for record in changed:
+                updated = _utc(record.date_metadata_updated)
+                if updated is None:
+                    continue
+                if cursor is None or updated > cursor:
+                    cursor, at_cursor, advanced = updated, set(), True
+                if updated == cursor:
+                    at_cursor.add(record.osti_id)
+
+            store.save(changed, name, { "updated": cursor.isoformat() if cursor else None,
+                                        "osti_ids": sorted(at_cursor) })
+            stored += len(changed)
+
+            if advanced:
+                break
+        else:
+            return stored
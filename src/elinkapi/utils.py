@@ -1,8 +1,141 @@
 import re
+import codecs
+import contextlib
+import json
+import os
 from .exceptions import NotFoundException,ForbiddenException,UnauthorizedException,ServerException,ConflictException,BadRequestException
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_WHITESPACE = re.compile(r"[\s,]*")
+
+def iter_json_array(chunks):
+    """
+    Incrementally decode the elements of a JSON array from an iterable of UTF-8 byte chunks
+    (such as a streaming response's iter_content()), yielding each element as soon as it
+    has fully arrived.  Only the element being decoded, and at most one chunk beyond it,
+    is held in memory.  If the document is not an array, it is decoded whole and yielded
+    as the single element.
+
+    Array elements are expected to be objects, arrays or strings, as returned by the API.
+
+    Arguments:
+        chunks -- iterable of bytes making up the JSON document
+
+    Raises:
+        json.JSONDecodeError: the document is malformed or truncated
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    finished = False
+
+    def more(minimum=1):
+        # append at least minimum characters from the stream, or all that remains of it;
+        # returns False if nothing more could be read
+        nonlocal buffer, finished
+        length = len(buffer)
+        while not finished and len(buffer) < length + minimum:
+            chunk = next(chunks, None)
+            if chunk is None:
+                finished = True
+                buffer += text.decode(b"", final=True)
+            else:
+                buffer += text.decode(chunk)
+        return len(buffer) > length
+
+    # find the start of the document
+    while not buffer.strip() and more():
+        pass
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+
+    if buffer[0] != "[":
+        # not an array; decode the single value whole
+        while more(len(buffer) or 1):
+            pass
+        yield json.loads(buffer)
+        return
+
+    position = 1
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position >= len(buffer):
+            if not more():
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # element incomplete; at least double what is buffered for it before trying again
+            if not more(len(buffer) - position):
+                raise
+            continue
+
+        yield value
+        buffer = buffer[end:]
+        position = 0
+
+def dump_json(value) -> bytes:
+    """
+    Serialize a value (dict, list, ...) as a UTF-8 JSON request body, using orjson if it
+    is installed (pip install elinkapi[fast]), otherwise the standard library.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+def dump_model(model, exclude_none=True) -> bytes:
+    """
+    Serialize a pydantic model (such as a Record) as a UTF-8 JSON request body.  This is
+    model_dump_json() without its final decoding to str, so the serializer's bytes are sent
+    as they are.
+    """
+    return model.__pydantic_serializer__.to_json(model, exclude_none=exclude_none)
+
+@contextlib.contextmanager
+def open_destination(dest):
+    """
+    A binary file to write downloaded content to.  A file object (anything with write()) is
+    used as it is.  For a path, the content is written to a ".part" file beside it, which
+    replaces the path only once complete, and is removed if the download fails.
+    """
+    if hasattr(dest, "write"):
+        yield dest
+        return
+
+    path = os.fspath(dest)
+    partial = path + ".part"
+    try:
+        with open(partial, "wb") as file:
+            yield file
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
 class Validation:
     _ROR_ID_PATTERN = re.compile("^(?:(?:(http(s?):\/\/)?(?:ror\.org\/)))?(0[a-hj-km-np-tv-z|0-9]{6}[0-9]{2})$")
+    _ENUM_VALUES = {}
+
+    @classmethod
+    def enum_values(cls, enumeration) -> frozenset:
+        """
+        The set of values of the members of an Enum, computed once per Enum.
+        """
+        values = cls._ENUM_VALUES.get(enumeration)
+        if values is None:
+            values = cls._ENUM_VALUES[enumeration] = frozenset(member.value for member in enumeration)
+        return values
 
     @classmethod
     def find_ror_value(cls, value:str) -> str:
@@ -15,6 +148,15 @@ class Validation:
             raise ValueError("Invalid ROR ID value.")
         
         return match.group(1)
+
+    @classmethod
+    def trusted(cls, info) -> bool:
+        """
+        Whether the model being validated is trusted data from the server, which has already
+        validated it; custom field validators then accept values without checking them.
+        Validate with context={"trusted": True} to request this.
+        """
+        return bool(info.context) and info.context.get("trusted", False)
     
     @classmethod
     def handle_response(self, response):
@@ -0,0 +1,140 @@
+import threading
+import time
+import requests
+from elinkapi.cache import RevisionCache, RecordCache, ConditionalCache
+
+def response(body, headers=None):
+    result = requests.Response()
+    result.status_code = 200
+    result._content = body
+    result.headers.update(headers or {})
+    return result
+
+class Loader:
+    """ a load callable counting its calls, returning each value in turn """
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.values[min(self.calls, len(self.values)) - 1]
+
+def test_record_cache_hit_and_miss():
+    cache = RecordCache()
+    load = Loader("one")
+
+    assert cache.get("a", load) == "one"
+    assert cache.get("a", load) == "one"
+    assert load.calls == 1
+    assert cache.as_dict()["hits"] == 1
+    assert cache.as_dict()["misses"] == 1
+
+def test_record_cache_evicts_least_recently_used():
+    cache = RecordCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+
+    # b was least recently used
+    assert cache.get("a", lambda: "new") == 1
+    assert cache.get("c", lambda: "new") == 3
+    assert cache.get("b", lambda: "new") == "new"
+    assert cache.evictions == 2
+
+def test_record_cache_expires_after_ttl():
+    cache = RecordCache(ttl=0.05)
+    load = Loader("old", "new")
+
+    assert cache.get("a", load) == "old"
+    time.sleep(0.1)
+    assert cache.get("a", load) == "new"
+    assert load.calls == 2
+
+def test_record_cache_stale_while_revalidate():
+    cache = RecordCache(ttl=0.05, stale_while_revalidate=60)
+    refreshed = threading.Event()
+
+    def load():
+        refreshed.set()
+        return "new"
+
+    cache.get("a", lambda: "old")
+    time.sleep(0.1)
+    # the stale entry is returned at once, while a fresh one is loaded
+    assert cache.get("a", load) == "old"
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if cache.get("a", load) == "new":
+            break
+        time.sleep(0.01)
+    assert cache.get("a", load) == "new"
+    assert cache.stale >= 1
+
+def test_record_cache_invalidate():
+    cache = RecordCache()
+    load = Loader("old", "new")
+
+    cache.get("a", load)
+    cache.invalidate("a", "missing")
+    assert cache.get("a", load) == "new"
+    assert cache.invalidations == 1
+
+def test_record_cache_ignores_loads_begun_before_invalidation():
+    cache = RecordCache()
+
+    def load():
+        # the record is altered while it is being read
+        cache.invalidate("a")
+        return "old"
+
+    assert cache.get("a", load) == "old"
+    assert cache.get("a", lambda: "new") == "new"
+
+def test_conditional_cache_conditions():
+    cache = ConditionalCache()
+    assert cache.conditions("a") == {}
+
+    cache.resolve("a", response(b"{}", { "ETag": '"1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT" }),
+                  lambda response: "value")
+    assert cache.conditions("a") == { "If-None-Match": '"1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT" }
+    assert cache.not_modified_value("a") == "value"
+    assert cache.not_modified_value("b") is None
+    assert cache.not_modified == 1
+
+def test_conditional_cache_reuses_unchanged_body():
+    cache = ConditionalCache()
+    convert = Loader("first", "second")
+
+    assert cache.resolve("a", response(b"[1]"), convert) == "first"
+    assert cache.resolve("a", response(b"[1]"), convert) == "first"
+    assert cache.resolve("a", response(b"[2]"), convert) == "second"
+    assert cache.as_dict() == { "not_modified": 0, "unchanged": 1, "changed": 2, "size": 1 }
+
+def test_conditional_cache_invalidate():
+    cache = ConditionalCache(maxsize=1)
+    cache.resolve("a", response(b"1", { "ETag": "a" }), lambda response: 1)
+    cache.resolve("b", response(b"2", { "ETag": "b" }), lambda response: 2)
+
+    assert cache.conditions("a") == {}
+    cache.invalidate("b")
+    assert len(cache) == 0
+
+def test_revision_cache(tmp_path):
+    cache = RevisionCache(tmp_path / "revisions.db", max_bytes=10)
+
+    assert cache.get("a") is None
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"
+    assert cache.size() == 10
+
+    # over max_bytes: the least recently used entry goes
+    cache.put("c", b"123")
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
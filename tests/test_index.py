@@ -0,0 +1,61 @@
+from datetime import date
+from elinkapi.index import RecordIndex
+from elinkapi.record import RecordResponse
+
+def record(osti_id, title="A record", published=date(2020, 1, 1), **values):
+    values = { "product_type": "TR", "description": None, "keywords": None, "workflow_status": "R",
+               "site_ownership_code": "OSTI", **values }
+    return RecordResponse.model_construct(osti_id=osti_id, title=title, publication_date=published, **values)
+
+def test_search_text_and_fields():
+    index = RecordIndex([record(1, "Neutron transport"),
+                         record(2, "Neutron scattering", product_type="JA", keywords=["Transport"]),
+                         record(3, "Something else")])
+
+    assert [found.osti_id for found in index.search("neutron transport")] == [1, 2]
+    assert [found.osti_id for found in index.search("NEUTRON", product_type="JA")] == [2]
+    assert index.count(product_type=["TR", "JA"]) == 3
+    assert index.count("missing") == 0
+    assert index.search(limit=1)[0].osti_id == 1
+
+def test_search_publication_dates():
+    index = RecordIndex([record(1, published=date(2019, 6, 1)),
+                         record(2, published=date(2020, 6, 1)),
+                         record(3, published=None)])
+
+    assert [found.osti_id for found in index.search(publication_date_from=date(2020, 1, 1))] == [2]
+    assert [found.osti_id for found in index.search(publication_date_to=date(2019, 6, 1))] == [1]
+
+def test_duplicate_ids_in_batch():
+    # the later record of a batch replaces the earlier
+    index = RecordIndex([record(1, "First", published=date(2019, 1, 1)),
+                         record(1, "Second", published=date(2021, 1, 1))])
+
+    assert len(index) == 1
+    assert index.get(1).title == "Second"
+    assert index.count(publication_date_to=date(2020, 1, 1)) == 0
+    assert index.count(publication_date_from=date(2020, 1, 1)) == 1
+    assert index.count("first") == 0
+
+def test_duplicate_ids_keep_other_records():
+    index = RecordIndex()
+    index.add(record(2, published=date(2020, 1, 1)))
+    index.update([record(1, published=date(2020, 1, 1)), record(1, published=date(2021, 1, 1))])
+
+    assert [found.osti_id for found in index.search(publication_date_to=date(2020, 12, 31))] == [2]
+    assert [found.osti_id for found in index.search(publication_date_from=date(2021, 1, 1))] == [1]
+
+def test_readd_and_remove():
+    index = RecordIndex([record(1, "Old title", published=date(2019, 1, 1))])
+    index.add(record(1, "New title", published=date(2022, 1, 1)))
+    index.update([record(1, "Newer title", published=date(2023, 1, 1))])
+
+    assert index.count("old") == 0
+    assert index.count("new") == 0
+    assert index.count("newer") == 1
+    assert index.count(publication_date_to=date(2022, 12, 31)) == 0
+
+    index.remove(1)
+    assert 1 not in index
+    assert index.count(publication_date_from=date(2000, 1, 1)) == 0
+    index.remove(1)
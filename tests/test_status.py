@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+import pytest
+from elinkapi import status
+from elinkapi.exceptions import NotFoundException
+from elinkapi.record import RecordResponse
+
+def record(osti_id, workflow_status):
+    return RecordResponse.model_construct(osti_id=osti_id, workflow_status=workflow_status, audit_logs=[])
+
+class FakeApi:
+    """ serves each record's workflow statuses in turn, one per poll; None for a deleted record """
+    def __init__(self, statuses, unlisted=()):
+        self.statuses = statuses
+        self.unlisted = set(unlisted)
+        self.polls = 0
+        self.lookups = []
+
+    def current(self, osti_id):
+        states = self.statuses[osti_id]
+        return states[min(self.polls, len(states)) - 1]
+
+    def query_records(self, osti_id, rows):
+        self.polls += 1
+        found = [record(each, self.current(each)) for each in osti_id
+                 if self.current(each) is not None and each not in self.unlisted]
+        # a server ignoring the filter returns other records too, and more pages
+        return SimpleNamespace(data=found + [record(999, "R")], __iter__=None)
+
+    def get_single_record(self, osti_id, cache=True):
+        self.lookups.append(osti_id)
+        if self.current(osti_id) is None:
+            raise NotFoundException("Record not found.")
+        return record(osti_id, self.current(osti_id))
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(status.time, "sleep", sleeps.append)
+    return sleeps
+
+def test_completed_and_failed(sleeps):
+    api = FakeApi({ 1: ["SO", "SO", "R"], 2: ["SO", "SF"] })
+    report = status.wait_for_status(api, [1, 2])
+
+    assert list(report.completed) == [1]
+    assert list(report.failed) == [2]
+    assert report.polls == 3
+    assert not report.timed_out and not report.missing
+
+def test_missing_at_first_poll(sleeps):
+    api = FakeApi({ 1: [None], 2: ["R"] })
+    report = status.wait_for_status(api, [1, 2])
+
+    assert isinstance(report.missing[1], NotFoundException)
+    assert list(report.completed) == [2]
+
+def test_missing_after_first_poll(sleeps):
+    api = FakeApi({ 1: ["SO", "SO", None] })
+    report = status.wait_for_status(api, [1], timeout=None)
+
+    assert list(report.missing) == [1]
+    assert report.polls == 3
+
+def test_record_not_listed_is_classified_by_lookup(sleeps):
+    # the query does not return the record, but it is already released
+    api = FakeApi({ 1: ["R"] }, unlisted=[1])
+    report = status.wait_for_status(api, [1])
+
+    assert list(report.completed) == [1]
+    assert report.polls == 1
+    assert api.lookups == [1]
+
+def test_first_wait_is_interval(sleeps):
+    api = FakeApi({ 1: ["SO", "SO", "SO", "R"] })
+    status.wait_for_status(api, [1], interval=4, min_interval=1, max_interval=8)
+
+    assert sleeps == [4, 6, 8]
+
+def test_timed_out(sleeps, monkeypatch):
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr(status.time, "monotonic", lambda: next(clock))
+    api = FakeApi({ 1: ["SO"] })
+    report = status.wait_for_status(api, [1], timeout=25)
+
+    assert report.timed_out[1].workflow_status == "SO"
+    assert report.polls == 3